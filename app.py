@@ -8,8 +8,11 @@ Author: Advanced Analytics Team
 import streamlit as st
 import pandas as pd
 import numpy as np
+import time
 from datetime import datetime
 
+import bundle
+import refresher
 import scraper
 import visualizations as viz
 
@@ -255,23 +258,52 @@ st.markdown("""
 
 # ============ DATA LOADING ============
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+@st.cache_resource(max_entries=2)  # One bundle per published snapshot, shared by sessions: never modify its frames
+def load_snapshot(version):
+    """Load one published snapshot of the AFCON data"""
+    return refresher.read_snapshot(version)
+
+
+@st.cache_data(max_entries=2, hash_funcs=bundle.HASH_FUNCS)
+def load_match_details(data):
+    """Lineups and goal events of every match of a data bundle"""
+    return scraper.build_match_details(data['matches'], data['players'])
+
+
 def load_data():
-    """Load all AFCON data with caching"""
-    with st.spinner('Chargement des données AFCON...'):
-        return scraper.load_all_data()
+    """Latest published AFCON data; builds run in the background refresher"""
+    if not refresher.EXTERNAL_REFRESHER:
+        refresher.start_background_refresher()
+    version = refresher.current_version()
+    if version is None:
+        st.info("⏳ Préparation des données AFCON en arrière-plan...")
+        time.sleep(2)
+        st.rerun()
+    return load_snapshot(version)
 
 # Load data
 try:
     data = load_data()
     teams_df = data['teams']
+    players_df = data['players']
     player_stats_df = data['player_stats']
     matches_df = data['matches']
+    matches_index = data['matches_index']
     team_stats_df = data['team_stats']
 except Exception as e:
     st.error(f"Erreur lors du chargement des données: {e}")
     st.stop()
 
+
+# Charts carry their theme in the 'afcon' Plotly template: they are shown
+# with theme=None, as Streamlit's own theme would be merged over it
+def figure(builder, *args, selection=(), **kwargs):
+    """
+    Build a chart, or reuse it if this data version already produced it
+    with the same options and `selection` (the choices `args` derive from)
+    """
+    return viz.cached_figure(builder, (data.version, selection, sorted(kwargs.items())), *args, **kwargs)
+
 # ============ SIDEBAR NAVIGATION ============
 
 st.sidebar.markdown("<h1 style='color: white; text-align: center;'>🏆 AFCON</h1>", unsafe_allow_html=True)
@@ -356,18 +388,18 @@ if page == "🏆 Overview CAN":
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(viz.plot_team_values(team_stats_df, top_n=10), use_container_width=True)
+        st.plotly_chart(figure(viz.plot_team_values, team_stats_df, top_n=10), use_container_width=True, theme=None)
     
     with col2:
-        st.plotly_chart(viz.plot_group_comparison(team_stats_df), use_container_width=True)
+        st.plotly_chart(figure(viz.plot_group_comparison, team_stats_df), use_container_width=True, theme=None)
     
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(viz.plot_age_distribution(teams_df), use_container_width=True)
+        st.plotly_chart(figure(viz.plot_age_distribution, players_df), use_container_width=True, theme=None)
     
     with col2:
-        st.plotly_chart(viz.plot_value_distribution(teams_df), use_container_width=True)
+        st.plotly_chart(figure(viz.plot_value_distribution, players_df), use_container_width=True, theme=None)
 
 # ============ PAGE 2: CHAMPIONS HISTORIQUES ============
 
@@ -688,12 +720,15 @@ elif page == "👥 Groupes & Classements":
     # Tabs for each group
     tabs = st.tabs(groups)
     
+    # All groups are ranked in one pass
+    standings_index = data['standings_index']
+    
     for tab, group in zip(tabs, groups):
         with tab:
             st.subheader(f"Classement {group}")
             
             # Get group standings
-            standings = scraper.get_group_standings(group)
+            standings = standings_index[group]
             
             # Display standings table
             standings_display = standings[['team_name', 'matches_played', 'wins', 'draws', 
@@ -730,18 +765,18 @@ elif page == "👥 Groupes & Classements":
             col1, col2 = st.columns(2)
             
             with col1:
-                fig = viz.plot_team_values(standings, top_n=None)
-                st.plotly_chart(fig, use_container_width=True)
+                fig = figure(viz.plot_team_values, standings, top_n=None, selection=group)
+                st.plotly_chart(fig, use_container_width=True, theme=None)
             
             with col2:
-                fig = viz.plot_goals_by_team(standings)
-                st.plotly_chart(fig, use_container_width=True)
+                fig = figure(viz.plot_goals_by_team, standings, selection=group)
+                st.plotly_chart(fig, use_container_width=True, theme=None)
     
     st.markdown("---")
     
     # Overall group comparison
     st.subheader("📊 Comparaison entre Groupes")
-    st.plotly_chart(viz.plot_group_comparison(team_stats_df), use_container_width=True)
+    st.plotly_chart(figure(viz.plot_group_comparison, team_stats_df), use_container_width=True, theme=None)
 
 # ============ PAGE 3: MATCHS & RÉSULTATS ============
 
@@ -755,10 +790,35 @@ elif page == "⚽ Matchs & Résultats":
     
     # Filter matches
     if selected_phase != 'Tous':
-        filtered_matches = matches_df[matches_df['phase'] == selected_phase]
+        filtered_matches = scraper.select_matches(matches_df, matches_index, 'phase', selected_phase)
     else:
         filtered_matches = matches_df
     
+    # Match centre: lineups and scorers of every listed match, from the loaded snapshot
+    events_df, lineups_df = load_match_details(data)
+    listed = filtered_matches['match_id']
+    events_df = events_df[events_df['match_id'].isin(listed)]
+    lineups_df = lineups_df[lineups_df['match_id'].isin(listed)]
+    lineups_by_match = dict(tuple(lineups_df.groupby(['match_id', 'side'])))
+    events_by_match = dict(tuple(events_df.groupby('match_id')))
+    
+    def show_match_centre(match):
+        """Expander with both lineups and the scorers of a match"""
+        home = lineups_by_match.get((match['match_id'], 'home'))
+        away = lineups_by_match.get((match['match_id'], 'away'))
+        if home is None and away is None:
+            return
+        with st.expander("📋 Compositions & buteurs"):
+            col_home, col_away = st.columns(2)
+            for col, lineup in ((col_home, home), (col_away, away)):
+                with col:
+                    if lineup is not None:
+                        st.markdown("<br>".join(f"**{n}** {p}" for n, p in zip(lineup['number'], lineup['player_name'])),
+                                    unsafe_allow_html=True)
+            goals = events_by_match.get(match['match_id'])
+            if goals is not None:
+                st.markdown("⚽ " + " • ".join(f"{p} ({m}')" for p, m in zip(goals['player_name'], goals['minute'])))
+    
     # Info banner
     st.markdown(f"""
     <div style='background: linear-gradient(135deg, #00F260, #0575E6); 
@@ -781,7 +841,7 @@ elif page == "⚽ Matchs & Résultats":
         
         for group in groups:
             st.markdown(f"### 🏟️ {group}")
-            group_matches = filtered_matches[filtered_matches['group'] == group].sort_values('date')
+            group_matches = scraper.select_matches(matches_df, matches_index, 'group', group)
             
             # Display matches for this group
             for idx, match in group_matches.iterrows():
@@ -816,6 +876,7 @@ elif page == "⚽ Matchs & Résultats":
                     with col_status:
                         st.markdown(f"🔔 **<span style='color: #00F260;'>À venir</span>**", unsafe_allow_html=True)
                     
+                    show_match_centre(match)
                     st.markdown("---")
             
             st.markdown("<br>", unsafe_allow_html=True)
@@ -861,6 +922,7 @@ elif page == "⚽ Matchs & Résultats":
                 with col_status:
                     st.markdown(f"🔔 **<span style='color: #00F260;'>À venir</span>**", unsafe_allow_html=True)
                 
+                show_match_centre(match)
                 st.markdown("---")
     
     #Statistics - only if there are finished matches
@@ -939,7 +1001,12 @@ elif page == "🌟 Top Players":
         
         if len(top_scorers) > 0:
             # Display chart
-            st.plotly_chart(viz.plot_top_scorers(filtered_players, top_n), use_container_width=True)
+            st.plotly_chart(
+                figure(viz.plot_top_scorers, filtered_players, top_n=top_n,
+                       selection=(selected_position, selected_team)),
+                use_container_width=True,
+                theme=None
+            )
             
             # Detailed table
             scorers_table = top_scorers[['player_name', 'team', 'position', 'goals', 'assists', 'games_played']].copy()
@@ -957,7 +1024,12 @@ elif page == "🌟 Top Players":
         
         if len(top_assisters) > 0:
             # Display chart
-            st.plotly_chart(viz.plot_top_assists(filtered_players, top_n), use_container_width=True)
+            st.plotly_chart(
+                figure(viz.plot_top_assists, filtered_players, top_n=top_n,
+                       selection=(selected_position, selected_team)),
+                use_container_width=True,
+                theme=None
+            )
             
             # Detailed table
             assisters_table = top_assisters[['player_name', 'team', 'position', 'assists', 'goals', 'games_played']].copy()
@@ -971,20 +1043,8 @@ elif page == "🌟 Top Players":
     with tab3:
         st.subheader("💎 Joueurs les Plus Chers")
         
-        # Get market values from squad data
-        all_valuable_players = []
-        for _, team in teams_df.iterrows():
-            squad = scraper.get_team_squad(team['team_name'])
-            for _, player in squad.iterrows():
-                all_valuable_players.append({
-                    'player_name': player['player_name'],
-                    'team': team['team_name'],
-                    'position': player['position'],
-                    'age': player['age'],
-                    'market_value': player['market_value']
-                })
-        
-        valuable_df = pd.DataFrame(all_valuable_players)
+        # Market values from the consolidated players table
+        valuable_df = players_df.rename(columns={'nationality': 'team'})
         
         # Apply filters
         if selected_position != 'Tous':
@@ -1008,7 +1068,12 @@ elif page == "🌟 Top Players":
         col1, col2 = st.columns(2)
         
         with col1:
-            st.plotly_chart(viz.plot_position_distribution(filtered_players), use_container_width=True)
+            st.plotly_chart(
+                figure(viz.plot_position_distribution, filtered_players,
+                       selection=(selected_position, selected_team)),
+                use_container_width=True,
+                theme=None
+            )
         
         with col2:
             # Create a simple stats comparison
@@ -1043,7 +1108,7 @@ elif page == "📊 Analyses Comparatives":
     
     if len(selected_teams) >= 2:
         # Radar chart comparison
-        st.plotly_chart(viz.plot_team_radar(team_stats_df, selected_teams), use_container_width=True)
+        st.plotly_chart(figure(viz.plot_team_radar, team_stats_df, selected_teams, selection=selected_teams), use_container_width=True, theme=None)
         
         # Side-by-side comparison
         st.subheader("📋 Comparaison Détaillée")
@@ -1074,8 +1139,10 @@ elif page == "📊 Analyses Comparatives":
         )
         
         st.plotly_chart(
-            viz.plot_performance_evolution(matches_df, selected_team_for_evolution),
-            use_container_width=True
+            figure(viz.plot_performance_evolution, matches_df, selected_team_for_evolution, matches_index,
+                   selection=selected_team_for_evolution),
+            use_container_width=True,
+            theme=None
         )
     else:
         st.info("Veuillez sélectionner au moins 2 équipes pour la comparaison")
@@ -1088,18 +1155,18 @@ elif page == "📊 Analyses Comparatives":
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(viz.plot_value_vs_performance(team_stats_df), use_container_width=True)
+        st.plotly_chart(figure(viz.plot_value_vs_performance, team_stats_df), use_container_width=True, theme=None)
     
     with col2:
-        st.plotly_chart(viz.plot_age_vs_value(teams_df), use_container_width=True)
+        st.plotly_chart(figure(viz.plot_age_vs_value, players_df, teams_df), use_container_width=True, theme=None)
     
     # Correlation heatmap
     st.subheader("🔗 Matrice de Corrélation")
-    st.plotly_chart(viz.plot_correlation_heatmap(team_stats_df), use_container_width=True)
+    st.plotly_chart(figure(viz.plot_correlation_heatmap, team_stats_df), use_container_width=True, theme=None)
     
     # Box plot
     st.subheader("📦 Distribution des Valeurs par Équipe")
-    st.plotly_chart(viz.plot_value_boxplot(teams_df), use_container_width=True)
+    st.plotly_chart(figure(viz.plot_value_boxplot, players_df), use_container_width=True, theme=None)
 
 # ============ FOOTER ============
 
@@ -0,0 +1,152 @@
+"""
+Stress test: cache writes and reads from several processes at once
+Writers keep replacing a dataset while readers validate every frame they
+load, first with the former in-place JSON writes, then with save_to_cache.
+A second phase has several processes request a missing dataset at the same
+time and counts how many of them build it.
+
+Usage: python -m benchmarks.bench_cache_concurrency
+"""
+
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import scraper
+
+WRITERS = 4
+READERS = 4
+DURATION = 3.0  # Seconds per mode
+BUILD_PROCESSES = 8
+BUILD_TIME = 0.5  # Seconds a simulated dataset build takes
+
+
+def _frame(seed):
+    """A self-checking frame: value == row * key on every row"""
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1_000, 20_000))
+    key = int(rng.integers(1, 1_000))
+    return pd.DataFrame({'key': key, 'value': np.arange(n) * key})
+
+
+def _valid(df):
+    return df is not None and len(df) > 0 and (df['value'].to_numpy() == np.arange(len(df)) * df['key'].iat[0]).all()
+
+
+def _legacy_write(cache_dir, seed):
+    with open(os.path.join(cache_dir, 'stress.json'), 'w', encoding='utf-8') as f:
+        json.dump(_frame(seed).to_dict('records'), f)
+
+
+def _legacy_read(cache_dir):
+    with open(os.path.join(cache_dir, 'stress.json'), 'r', encoding='utf-8') as f:
+        return pd.DataFrame(json.load(f))
+
+
+def _writer(mode, cache_dir, worker, deadline, writes):
+    scraper.CACHE_DIR = cache_dir
+    count = 0
+    while time.time() < deadline:
+        seed = worker + count * WRITERS
+        if mode == 'legacy':
+            _legacy_write(cache_dir, seed)
+        else:
+            scraper.save_to_cache(_frame(seed), 'stress')
+        count += 1
+    writes.put(count)
+
+
+def _reader(mode, cache_dir, deadline, results):
+    scraper.CACHE_DIR = cache_dir
+    reads = corrupted = 0
+    while time.time() < deadline:
+        try:
+            df = _legacy_read(cache_dir) if mode == 'legacy' else scraper.get_cached_data('stress')
+            ok = _valid(df)
+        except Exception:
+            ok = False
+        reads += 1
+        corrupted += not ok
+    results.put((reads, corrupted))
+
+
+def _stress(mode):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Start from a valid file so every failed read is a torn one
+        scraper.CACHE_DIR = cache_dir
+        if mode == 'legacy':
+            _legacy_write(cache_dir, 0)
+        else:
+            scraper.save_to_cache(_frame(0), 'stress')
+        deadline = time.time() + DURATION
+        writes, results = multiprocessing.Queue(), multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_writer, args=(mode, cache_dir, i, deadline, writes))
+                     for i in range(WRITERS)]
+        processes += [multiprocessing.Process(target=_reader, args=(mode, cache_dir, deadline, results))
+                      for _ in range(READERS)]
+        for p in processes:
+            p.start()
+        counts = [results.get() for _ in range(READERS)]
+        total_writes = sum(writes.get() for _ in range(WRITERS))
+        for p in processes:
+            p.join()
+    reads = sum(r for r, _ in counts)
+    corrupted = sum(c for _, c in counts)
+    return total_writes, reads, corrupted
+
+
+def _build_stress(counter):
+    """Simulated expensive build that records every invocation"""
+    with open(counter, 'a') as f:
+        f.write(f"{os.getpid()}\n")
+    time.sleep(BUILD_TIME)
+    return _frame(1)
+
+
+def _request_dataset(cache_dir, counter, start, results):
+    scraper.CACHE_DIR = cache_dir
+    time.sleep(max(0.0, start - time.time()))
+    df = scraper._load_dataset('stress', lambda: _build_stress(counter))
+    results.put(_valid(df))
+
+
+def _single_flight():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        counter = os.path.join(cache_dir, 'builds.txt')
+        start = time.time() + 0.5
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_request_dataset, args=(cache_dir, counter, start, results))
+                     for _ in range(BUILD_PROCESSES)]
+        for p in processes:
+            p.start()
+        valid = sum(results.get() for _ in processes)
+        for p in processes:
+            p.join()
+        with open(counter) as f:
+            builds = len(f.read().split())
+    return builds, valid
+
+
+def run():
+    original_dir = scraper.CACHE_DIR
+    try:
+        print(f"{WRITERS} writers, {READERS} readers, {DURATION:.0f}s per mode")
+        print(f"{'mode':>18} {'writes':>8} {'reads':>8} {'corrupted':>10}")
+        for label, mode in (('in-place json', 'legacy'), ('atomic arrow', 'atomic')):
+            writes, reads, corrupted = _stress(mode)
+            print(f"{label:>18} {writes:>8} {reads:>8} {corrupted:>10}")
+
+        builds, valid = _single_flight()
+        print(f"\n{BUILD_PROCESSES} processes requesting a missing dataset: "
+              f"{builds} build(s), {valid}/{BUILD_PROCESSES} valid results")
+    finally:
+        scraper.CACHE_DIR = original_dir
+
+
+if __name__ == "__main__":
+    run()
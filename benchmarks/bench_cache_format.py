@@ -0,0 +1,66 @@
+"""
+Benchmark: legacy JSON cache vs columnar Arrow cache
+Compares cold loads of the dashboard datasets at 1x and 100x data size.
+
+Usage: python -m benchmarks.bench_cache_format
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import scraper
+
+
+def _time(func, repeat=5):
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _scaled(frames, factor):
+    """Replicate every frame `factor` times"""
+    return {name: pd.concat([df] * factor, ignore_index=True) for name, df in frames.items()}
+
+
+def run():
+    frames = scraper.load_all_data()
+    frames = {name: frames[name] for name in ('teams', 'player_stats', 'matches', 'team_stats')}
+    original_dir = scraper.CACHE_DIR
+
+    print(f"{'size':>6} {'format':>6} {'disk (KB)':>10} {'load (ms)':>10}")
+    try:
+        for factor in (1, 100):
+            data = _scaled(frames, factor)
+            with tempfile.TemporaryDirectory() as tmp:
+                scraper.CACHE_DIR = tmp
+                for name, df in data.items():
+                    scraper.save_to_cache(df, name)
+                    with open(os.path.join(tmp, f"{name}.json"), 'w', encoding='utf-8') as f:
+                        json.dump(df.to_dict('records'), f, ensure_ascii=False, indent=2)
+
+                def load_json():
+                    for name in data:
+                        with open(os.path.join(tmp, f"{name}.json"), 'r', encoding='utf-8') as f:
+                            pd.DataFrame(json.load(f))
+
+                def load_arrow():
+                    for name in data:
+                        scraper.get_cached_data(name)
+
+                for label, ext, loader in (('json', '.json', load_json), ('arrow', '.arrow', load_arrow)):
+                    size = sum(os.path.getsize(os.path.join(tmp, f"{name}{ext}")) for name in data)
+                    print(f"{factor:>5}x {label:>6} {size / 1024:>10.0f} {_time(loader):>10.2f}")
+    finally:
+        scraper.CACHE_DIR = original_dir
+
+
+if __name__ == "__main__":
+    run()
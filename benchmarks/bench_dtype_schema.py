@@ -0,0 +1,39 @@
+"""
+Benchmark: memory of the dashboard datasets with and without schema dtypes
+Replicates one tournament into several editions (teams, clubs and phases
+repeat from one edition to the next) and reports deep memory per dataset.
+
+Usage: python -m benchmarks.bench_dtype_schema
+"""
+
+import pandas as pd
+
+import schema
+import scraper
+
+EDITIONS = (1, 10, 50)
+DATASETS = ('teams', 'players', 'player_stats', 'matches', 'team_stats')
+
+
+def _raw_frames():
+    """Datasets as read from the cache, before the schema"""
+    scraper.load_all_data()
+    return {name: scraper.get_cached_data(name) for name in DATASETS}
+
+
+def run():
+    frames = _raw_frames()
+    print(f"{'editions':>8} {'dataset':>13} {'rows':>8} {'before (KB)':>12} {'after (KB)':>11} {'reduction':>10}")
+    for editions in EDITIONS:
+        data = {name: pd.concat([df] * editions, ignore_index=True) for name, df in frames.items()}
+        report = schema.memory_report(data)
+        for row in report.itertuples():
+            print(f"{editions:>8} {row.dataset:>13} {row.rows:>8} {row.before_bytes / 1024:>12.0f} "
+                  f"{row.after_bytes / 1024:>11.0f} {row.reduction:>9.1f}x")
+        before, after = report['before_bytes'].sum(), report['after_bytes'].sum()
+        print(f"{editions:>8} {'total':>13} {report['rows'].sum():>8} {before / 1024:>12.0f} "
+              f"{after / 1024:>11.0f} {before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,97 @@
+"""
+Benchmark: build time and JSON size of every chart builder with the former
+per-figure apply_custom_theme (three layout updates on every figure) vs the
+registered AFCON template referenced by name
+
+Usage: python -m benchmarks.bench_figure_theme
+"""
+
+import time
+
+import plotly.io as pio
+
+import scraper
+import visualizations as viz
+
+
+def _legacy_apply_custom_theme(fig, title=None):
+    """apply_custom_theme before the registered template"""
+    fig.update_layout(
+        title=title,
+        title_font_size=22,
+        title_font_color='white',
+        title_font_family='Poppins, sans-serif',
+        title_font_weight=600,
+        font=dict(family="Poppins, sans-serif", size=13, color='white'),
+        plot_bgcolor='rgba(10, 14, 39, 0.5)',
+        paper_bgcolor='rgba(0, 0, 0, 0)',
+        hovermode='closest',
+        showlegend=True,
+        legend=dict(
+            bgcolor='rgba(26, 29, 58, 0.9)',
+            bordercolor='rgba(0, 242, 96, 0.3)',
+            borderwidth=1,
+            font=dict(color='white')
+        )
+    )
+    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='rgba(0, 242, 96, 0.15)', color='white')
+    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='rgba(0, 242, 96, 0.15)', color='white')
+    return fig
+
+
+def _builders(data):
+    teams, players = data['teams'], data['players']
+    player_stats, matches, team_stats = data['player_stats'], data['matches'], data['team_stats']
+    team = teams['team_name'].iat[0]
+    return [
+        ('team_values', lambda: viz.plot_team_values(team_stats, top_n=10)),
+        ('goals_by_team', lambda: viz.plot_goals_by_team(team_stats)),
+        ('top_scorers', lambda: viz.plot_top_scorers(player_stats)),
+        ('top_assists', lambda: viz.plot_top_assists(player_stats)),
+        ('age_distribution', lambda: viz.plot_age_distribution(players)),
+        ('value_distribution', lambda: viz.plot_value_distribution(players)),
+        ('league_distribution', lambda: viz.plot_league_distribution(players)),
+        ('position_distribution', lambda: viz.plot_position_distribution(player_stats)),
+        ('value_boxplot', lambda: viz.plot_value_boxplot(players)),
+        ('value_vs_performance', lambda: viz.plot_value_vs_performance(team_stats)),
+        ('age_vs_value', lambda: viz.plot_age_vs_value(players, teams)),
+        ('correlation_heatmap', lambda: viz.plot_correlation_heatmap(team_stats)),
+        ('team_radar', lambda: viz.plot_team_radar(team_stats, teams['team_name'].head(3).tolist())),
+        ('performance_evolution', lambda: viz.plot_performance_evolution(matches, team, data['matches_index'])),
+        ('group_comparison', lambda: viz.plot_group_comparison(team_stats)),
+    ]
+
+
+def _measure(build, repeat=10):
+    """Best build time (ms) and JSON size (bytes) of one builder"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = build()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(pio.to_json(fig, validate=False).encode())
+
+
+def run():
+    data = scraper.load_all_data()
+    themed = viz.apply_custom_theme
+    results = {}
+    try:
+        for label, theme in (('legacy', _legacy_apply_custom_theme), ('template', themed)):
+            viz.apply_custom_theme = theme
+            results[label] = {name: _measure(build) for name, build in _builders(data)}
+    finally:
+        viz.apply_custom_theme = themed
+
+    print(f"base template: {pio.templates.default}")
+    print(f"{'builder':>22} {'legacy (ms)':>12} {'template (ms)':>14} {'legacy (KB)':>12} {'template (KB)':>14}")
+    for name in results['legacy']:
+        (old_ms, old_bytes), (new_ms, new_bytes) = results['legacy'][name], results['template'][name]
+        print(f"{name:>22} {old_ms:>12.1f} {new_ms:>14.1f} {old_bytes / 1024:>12.1f} {new_bytes / 1024:>14.1f}")
+    old_ms, old_bytes = map(sum, zip(*results['legacy'].values()))
+    new_ms, new_bytes = map(sum, zip(*results['template'].values()))
+    print(f"{'total':>22} {old_ms:>12.1f} {new_ms:>14.1f} {old_bytes / 1024:>12.1f} {new_bytes / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    run()
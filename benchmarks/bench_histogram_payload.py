@@ -0,0 +1,57 @@
+"""
+Benchmark: figure payload of the histogram charts with raw values sent to
+the browser vs counts binned server-side
+Players are resampled from the tournament squads to reach each size; the
+payload is the figure JSON Streamlit sends to the browser.
+
+Usage: python -m benchmarks.bench_histogram_payload
+"""
+
+import time
+
+import numpy as np
+import plotly.io as pio
+
+import scraper
+import visualizations as viz
+
+SIZES = (500, 50_000, 500_000)
+
+
+def _players(base, size, seed=0):
+    """`size` players drawn with replacement from `base`"""
+    rng = np.random.default_rng(seed)
+    return base.iloc[rng.integers(0, len(base), size)].reset_index(drop=True)
+
+
+def _measure(build):
+    """Build time (ms) and JSON payload (bytes) of one figure"""
+    start = time.perf_counter()
+    fig = build()
+    payload = pio.to_json(fig, validate=False)
+    return (time.perf_counter() - start) * 1000, len(payload.encode())
+
+
+def run():
+    base = scraper.load_all_data()['players']
+    charts = (('age', viz.plot_age_distribution), ('value', viz.plot_value_distribution))
+    print(f"{'players':>8} {'chart':>6} {'raw (KB)':>10} {'binned (KB)':>12} {'raw (ms)':>9} {'binned (ms)':>12}")
+    for size in SIZES:
+        players = _players(base, size)
+        for label, builder in charts:
+            raw_ms, raw_bytes = _measure(lambda: builder(players, binned=False))
+            binned_ms, binned_bytes = _measure(lambda: builder(players))
+            print(f"{size:>8} {label:>6} {raw_bytes / 1024:>10.1f} {binned_bytes / 1024:>12.1f} "
+                  f"{raw_ms:>9.1f} {binned_ms:>12.1f}")
+
+    # Edges computed once on the full data keep filtered views comparable
+    values_m = base['market_value'].to_numpy()
+    edges = viz.histogram_edges(values_m[values_m > 0] / 1_000_000, viz.VALUE_BINS)
+    subset = base[base['position'] == 'Forward']
+    fig = viz.plot_value_distribution(subset, bin_edges=edges)
+    print(f"\nfiltered view ({len(subset)} forwards) on shared edges: "
+          f"{len(fig.data[0].y)} bins, {int(sum(fig.data[0].y))} players counted")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,110 @@
+"""
+Benchmark: parse time of Transfermarkt pages
+Compares the naive full-tree BeautifulSoup parse (one dict per row) with
+the targeted lxml XPath parser of scraper (column arrays), on the saved
+fixtures in benchmarks/fixtures.
+
+Usage: python -m benchmarks.bench_html_parsing
+"""
+
+import os
+import re
+import time
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+import scraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def naive_squad_page(html, team_name):
+    """Former parser: full BeautifulSoup tree and CSS selectors per row"""
+    soup = BeautifulSoup(html, 'lxml')
+    players = []
+    for row in soup.select('table.items > tbody > tr'):
+        name = row.select_one('td.hauptlink a')
+        if name is None:
+            continue
+        number = row.select_one('div.rn_nummer')
+        position = row.select_one('table.inline-table tr:nth-of-type(2) td')
+        age = re.search(r'\((\d+)\)', row.get_text(' '))
+        club = row.select_one('td.zentriert a img[alt]')
+        value = row.select_one('td.rechts.hauptlink')
+        players.append({
+            'player_name': name.get_text(strip=True),
+            'number': scraper._to_int(number.get_text()) if number else 0,
+            'position': scraper._position_group(position.get_text(strip=True) if position else ''),
+            'age': int(age.group(1)) if age else None,
+            'club': club['alt'] if club else None,
+            'market_value': scraper.clean_value(value.get_text(strip=True) if value else ''),
+            'nationality': team_name
+        })
+    return players
+
+
+def naive_player_stats_page(html):
+    """Former parser: full BeautifulSoup tree, header-driven cell lookup per row"""
+    soup = BeautifulSoup(html, 'lxml')
+    headers = []
+    for th in soup.select('table.items > thead > tr > th'):
+        titled = th if th.get('title') else th.select_one('[title]')
+        headers.append((titled['title'] if titled else th.get_text(strip=True)).lower())
+
+    stats = []
+    for row in soup.select('table.items > tbody > tr'):
+        name = row.select_one('td.hauptlink a')
+        if name is None:
+            continue
+        cells = row.find_all('td', recursive=False)
+        flag = row.select_one('img.flaggenrahmen[title]')
+        position = row.select_one('table.inline-table tr:nth-of-type(2) td')
+        record = {
+            'player_name': name.get_text(strip=True),
+            'team': flag['title'] if flag else None,
+            'position': scraper._position_group(position.get_text(strip=True) if position else ''),
+        }
+        for column in scraper.STATS_COLUMNS.values():
+            record[column] = 0
+        for header, cell in zip(headers, cells):
+            if header in scraper.STATS_COLUMNS:
+                record[scraper.STATS_COLUMNS[header]] = scraper._to_int(cell.get_text())
+        stats.append(record)
+    return stats
+
+
+def _time(func, repeat=20):
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run():
+    with open(os.path.join(FIXTURES, 'squad_morocco.html'), encoding='utf-8') as f:
+        squad_html = f.read()
+    with open(os.path.join(FIXTURES, 'player_stats_page_1.html'), encoding='utf-8') as f:
+        stats_html = f.read()
+
+    cases = (
+        ('squad page', lambda: naive_squad_page(squad_html, 'Morocco'),
+         lambda: scraper.parse_squad_page(squad_html, 'Morocco')),
+        ('player stats page', lambda: naive_player_stats_page(stats_html),
+         lambda: scraper.parse_player_stats_page(stats_html)),
+    )
+    print(f"{'page':<18} {'BeautifulSoup (ms)':>19} {'lxml XPath (ms)':>16} {'speedup':>8}")
+    for label, naive, fast in cases:
+        # Both parsers must agree before their timings mean anything
+        expected = pd.DataFrame(naive())
+        got = pd.DataFrame(fast())
+        pd.testing.assert_frame_equal(expected, got, check_dtype=False)
+        naive_ms, fast_ms = _time(naive), _time(fast)
+        print(f"{label:<18} {naive_ms:>19.2f} {fast_ms:>16.2f} {naive_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run()
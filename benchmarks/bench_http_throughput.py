@@ -0,0 +1,67 @@
+"""
+Benchmark: crawl throughput of safe_request against a local mock HTTP server
+Compares the former bare requests.get + fixed sleep with the pooled session
+and per-host token bucket, both at the same sustained politeness budget.
+
+Usage: python -m benchmarks.bench_http_throughput
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import scraper
+
+PAGES = 60
+RATE = 20.0  # Sustained requests per second for both strategies (scaled down 2 s budget)
+LATENCY = 0.01  # Simulated server think time
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Allows keep-alive
+    body = b'<html><body><table class="items"></table></body></html>' * 50
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _legacy_fetch(url):
+    """The original safe_request: fixed delay, new connection every time"""
+    time.sleep(1 / RATE)
+    response = requests.get(url, headers=scraper.HEADERS, timeout=10)
+    response.raise_for_status()
+    return response
+
+
+def run():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/page"
+
+    scraper.RATE_LIMIT_PER_SECOND = RATE
+    scraper._host_buckets.clear()
+
+    try:
+        for label, fetch in (('fixed sleep + requests.get', _legacy_fetch),
+                             ('pooled session + token bucket', scraper.safe_request)):
+            start = time.perf_counter()
+            for i in range(PAGES):
+                fetch(f"{url}/{i}")
+            elapsed = time.perf_counter() - start
+            print(f"{label:<32} {PAGES / elapsed:>7.1f} pages/s ({elapsed:.2f} s for {PAGES} pages)")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,89 @@
+"""
+Benchmark: vectorized market value parsing vs the former scalar clean_value
+Runs both on value columns of increasing size, then parses a squad page
+with thousands of rows built from the saved fixture.
+
+Usage: python -m benchmarks.bench_market_values
+"""
+
+import os
+import time
+
+import numpy as np
+
+import scraper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+SAMPLES = ['€80.00m', '€12.50m', '€900k', '€1.20bn', '-', '€3,5m', '€250Th.', '€500k']
+
+
+def scalar_clean_value(value_str):
+    """Former per-string parser, kept here as the baseline"""
+    if not value_str or value_str == '-':
+        return 0
+
+    value_str = value_str.replace('€', '').replace('£', '').replace('$', '').strip()
+
+    multiplier = 1
+    if 'm' in value_str.lower():
+        multiplier = 1000000
+        value_str = value_str.lower().replace('m', '')
+    elif 'k' in value_str.lower():
+        multiplier = 1000
+        value_str = value_str.lower().replace('k', '')
+
+    try:
+        return float(value_str) * multiplier
+    except:
+        return 0
+
+
+def _time(func, repeat=5):
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _large_squad_page(rows):
+    """Fixture squad page with its table rows repeated up to `rows` rows"""
+    with open(os.path.join(FIXTURES, 'squad_morocco.html'), encoding='utf-8') as f:
+        html = f.read()
+    head, rest = html.split('<tbody>', 1)
+    body, tail = rest.split('</tbody>', 1)
+    repeat = rows // body.count('<tr class=') + 1
+    return f"{head}<tbody>{body * repeat}</tbody>{tail}"
+
+
+def run():
+    print(f"{'values':>8} {'scalar (ms)':>12} {'vectorized (ms)':>16} {'speedup':>8}")
+    for size in (1_000, 10_000, 100_000):
+        values = np.array(SAMPLES * (size // len(SAMPLES)), dtype=object)
+        scalar_ms = _time(lambda: np.array([scalar_clean_value(v) for v in values]))
+        vector_ms = _time(lambda: scraper.parse_market_values(values))
+        print(f"{size:>8} {scalar_ms:>12.2f} {vector_ms:>16.2f} {scalar_ms / vector_ms:>7.1f}x")
+
+    # Worst case for the vectorized parser: no repeated strings
+    distinct = np.array([f"€{i / 100:.2f}m" for i in range(100_000)], dtype=object)
+    scalar_ms = _time(lambda: np.array([scalar_clean_value(v) for v in distinct]))
+    vector_ms = _time(lambda: scraper.parse_market_values(distinct))
+    print(f"{'distinct':>8} {scalar_ms:>12.2f} {vector_ms:>16.2f} {scalar_ms / vector_ms:>7.1f}x")
+
+    # Formats the scalar parser got wrong
+    parsed, valid = scraper.parse_market_values(SAMPLES)
+    for raw, old, new, ok in zip(SAMPLES, map(scalar_clean_value, SAMPLES), parsed, valid):
+        print(f"  {raw:>8}: scalar {old:>14,.0f}  vectorized {new:>14,.0f}  valid={ok}")
+
+    html = _large_squad_page(5_000)
+    start = time.perf_counter()
+    columns = scraper.parse_squad_page(html, 'Morocco')
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"squad page with {len(columns['player_name'])} rows parsed in {elapsed:.1f} ms, "
+          f"total value €{columns['market_value'].sum() / 1e9:.2f}bn")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,50 @@
+"""
+Benchmark: scatter figures at player-level point counts in each mode
+(SVG with every label, WebGL with decimated labels, density grid with a
+hover sample). Rows are resampled from the team stats with jitter to
+reach each size; the payload is the figure JSON sent to the browser.
+
+Usage: python -m benchmarks.bench_scatter_modes
+"""
+
+import time
+
+import numpy as np
+import plotly.io as pio
+
+import scraper
+import visualizations as viz
+
+SIZES = (500, 50_000, 500_000)
+MODES = ('svg', 'webgl', 'density')
+
+
+def _rows(base, size, seed=0):
+    """`size` rows drawn from `base`, values jittered so points do not overlap"""
+    rng = np.random.default_rng(seed)
+    df = base.iloc[rng.integers(0, len(base), size)].reset_index(drop=True)
+    df['squad_value'] = df['squad_value'] * rng.uniform(0.5, 1.5, size)
+    df['goals_scored'] = df['goals_scored'] + rng.integers(0, 10, size)
+    return df
+
+
+def _measure(build):
+    """Build time (ms), JSON payload (bytes) and trace types of one figure"""
+    start = time.perf_counter()
+    fig = build()
+    payload = pio.to_json(fig, validate=False)
+    return (time.perf_counter() - start) * 1000, len(payload.encode()), [t.type for t in fig.data]
+
+
+def run():
+    base = scraper.load_all_data()['team_stats']
+    print(f"{'points':>8} {'mode':>8} {'payload (KB)':>13} {'build (ms)':>11}  traces")
+    for size in SIZES:
+        df = _rows(base, size)
+        for mode in MODES:
+            ms, size_bytes, traces = _measure(lambda: viz.plot_value_vs_performance(df, mode=mode))
+            print(f"{size:>8} {mode:>8} {size_bytes / 1024:>13.1f} {ms:>11.1f}  {', '.join(traces)}")
+
+
+if __name__ == "__main__":
+    run()
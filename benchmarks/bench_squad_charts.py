@@ -0,0 +1,118 @@
+"""
+Benchmark: squad-based chart builders fed a players frame vs the former
+per-team get_team_squad loops
+Times the data preparation alone and the full figure build of each chart.
+
+Usage: python -m benchmarks.bench_squad_charts
+"""
+
+import time
+
+import pandas as pd
+
+import scraper
+import visualizations as viz
+
+
+def _legacy_age_data(teams_df):
+    all_ages = []
+    for _, team in teams_df.iterrows():
+        squad = scraper.get_team_squad(team['team_name'])
+        all_ages.extend(squad['age'].tolist())
+    return all_ages
+
+
+def _legacy_value_data(teams_df):
+    all_values = []
+    for _, team in teams_df.iterrows():
+        squad = scraper.get_team_squad(team['team_name'])
+        all_values.extend(squad['market_value'].tolist())
+    return [v / 1_000_000 for v in all_values if v > 0]
+
+
+def _legacy_league_data(teams_df):
+    league_counts = {}
+    for _, team in teams_df.iterrows():
+        squad = scraper.get_team_squad(team['team_name'])
+        for club in squad['club']:
+            league_counts[club] = league_counts.get(club, 0) + 1
+    return sorted(league_counts.items(), key=lambda x: x[1], reverse=True)
+
+
+def _legacy_boxplot_data(teams_df):
+    data = []
+    for _, team in teams_df.iterrows():
+        squad = scraper.get_team_squad(team['team_name'])
+        for _, player in squad.iterrows():
+            data.append({'team': team['team_name'], 'value': player['market_value'] / 1_000_000})
+    return pd.DataFrame(data)
+
+
+def _legacy_age_vs_value_data(teams_df):
+    data = []
+    for _, team in teams_df.iterrows():
+        squad = scraper.get_team_squad(team['team_name'])
+        data.append({'team': team['team_name'], 'avg_age': squad['age'].mean(),
+                     'squad_value': team['squad_value'] / 1_000_000})
+    return pd.DataFrame(data)
+
+
+def _new_age_data(players):
+    return players['age'].to_numpy()
+
+
+def _new_value_data(players):
+    values = players['market_value'].to_numpy()
+    return values[values > 0] / 1_000_000
+
+
+def _new_league_data(players):
+    counts = players['club'].value_counts()
+    return counts[counts > 0]
+
+
+def _new_boxplot_data(players):
+    return pd.DataFrame({'team': players['nationality'].astype(str).to_numpy(),
+                         'value': players['market_value'].to_numpy() / 1_000_000})
+
+
+def _new_age_vs_value_data(players, teams):
+    avg_age = players.groupby('nationality', observed=True)['age'].mean()
+    return pd.DataFrame({'team': teams['team_name'].to_numpy(),
+                         'avg_age': teams['team_name'].map(avg_age).to_numpy(),
+                         'squad_value': teams['squad_value'].to_numpy() / 1_000_000})
+
+
+def _time(func, repeat=20):
+    """Best wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run():
+    data = scraper.load_all_data()
+    teams, players = data['teams'], data['players']
+    charts = [
+        ('age histogram', lambda: _legacy_age_data(teams), lambda: _new_age_data(players),
+         lambda: viz.plot_age_distribution(players)),
+        ('value histogram', lambda: _legacy_value_data(teams), lambda: _new_value_data(players),
+         lambda: viz.plot_value_distribution(players)),
+        ('league pie', lambda: _legacy_league_data(teams), lambda: _new_league_data(players),
+         lambda: viz.plot_league_distribution(players)),
+        ('value boxplot', lambda: _legacy_boxplot_data(teams), lambda: _new_boxplot_data(players),
+         lambda: viz.plot_value_boxplot(players)),
+        ('age vs value', lambda: _legacy_age_vs_value_data(teams), lambda: _new_age_vs_value_data(players, teams),
+         lambda: viz.plot_age_vs_value(players, teams)),
+    ]
+    print(f"{len(players)} players, {len(teams)} teams (get_team_squad memoized)")
+    print(f"{'chart':>16} {'data: loop (ms)':>16} {'data: frame (ms)':>17} {'full build (ms)':>16}")
+    for label, legacy, new, build in charts:
+        print(f"{label:>16} {_time(legacy):>16.2f} {_time(new):>17.3f} {_time(build, repeat=5):>16.2f}")
+
+
+if __name__ == "__main__":
+    run()
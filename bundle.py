@@ -0,0 +1,76 @@
+"""
+Versioned, immutable bundle of the dashboard datasets
+The version is a content hash computed once when the bundle is built, so
+caches key on it instead of hashing every DataFrame on every call
+"""
+
+import hashlib
+from collections.abc import Mapping
+
+import pandas as pd
+
+
+def content_hash(items):
+    """
+    Digest of the DataFrames of a {name: value} mapping: column names,
+    dtypes and row hashes. Other values (indexes derived from the frames)
+    are not hashed.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(items):
+        value = items[name]
+        if not isinstance(value, pd.DataFrame):
+            continue
+        digest.update(name.encode())
+        digest.update(repr([(str(c), str(t)) for c, t in value.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class DatasetBundle(Mapping):
+    """
+    Read-only mapping of dataset name -> DataFrame (or derived index),
+    identified by `version`. Two bundles with the same version hold the
+    same data, so the version is a complete cache key: hashing a bundle
+    costs O(1) whatever the size of the frames.
+
+    Only the mapping is immutable: the frames it hands out are the shared
+    originals, not copies (the app keeps one bundle per snapshot in
+    st.cache_resource for every session). Callers must not modify them in
+    place; derive a new frame (.copy(), .assign(), filtering) instead.
+    """
+
+    __slots__ = ('_items', 'version')
+
+    def __init__(self, items, version=None):
+        object.__setattr__(self, '_items', dict(items))
+        object.__setattr__(self, 'version', version or content_hash(self._items))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DatasetBundle is immutable")
+
+    def __getitem__(self, name):
+        return self._items[name]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __hash__(self):
+        return hash(self.version)
+
+    def __eq__(self, other):
+        return isinstance(other, DatasetBundle) and other.version == self.version
+
+    def __reduce__(self):
+        return (DatasetBundle, (self._items, self.version))
+
+    def __repr__(self):
+        return f"DatasetBundle(version={self.version!r}, datasets={list(self._items)})"
+
+
+# For st.cache_data(hash_funcs=HASH_FUNCS): a bundle argument is keyed by its
+# version (see load_match_details in app.py)
+HASH_FUNCS = {DatasetBundle: lambda data: data.version}
@@ -0,0 +1,186 @@
+"""
+Crawl engine for Transfermarkt pages
+Fetches many pages concurrently with asyncio, under a global concurrency cap
+and the per-host rate budget enforced by scraper.safe_request
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+import scraper
+
+# Maximum number of pages in flight at once, across all hosts
+MAX_CONCURRENCY = 8
+# Player statistics are paginated on Transfermarkt
+STATS_PAGES = 5
+
+# Marker for pages answered with 304 whose parsed records are already cached
+NOT_MODIFIED = object()
+
+
+async def _fetch_page(key, url, parse, semaphore, latencies, offline, skip_unchanged):
+    """Fetch and parse one page; returns (key, records), (key, NOT_MODIFIED) or (key, exception)"""
+    if offline:
+        html = scraper.archived_html(url)
+        if html is None:
+            return key, RuntimeError(f"{url} is not archived")
+    else:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await asyncio.to_thread(scraper.safe_request, url)
+            latencies.append(time.perf_counter() - start)
+        if response is None:
+            return key, RuntimeError(f"no response for {url}")
+        if response.status_code == 304 and key in skip_unchanged:
+            return key, NOT_MODIFIED
+        html = response.text
+    try:
+        return key, await asyncio.to_thread(parse, html)
+    except Exception as e:
+        return key, e
+
+
+async def crawl_async(jobs, on_records=None, concurrency=MAX_CONCURRENCY,
+                      offline=False, skip_unchanged=()):
+    """
+    Crawl (key, url, parse) jobs concurrently.
+    on_records(key, records) is called as soon as each page is parsed; a page
+    that fails is reported and skipped without aborting the batch.
+    offline re-parses the raw archive without touching the network;
+    pages of keys in skip_unchanged that are answered with 304 are left
+    unparsed (listed in the report's 'not_modified').
+    Returns: (dict key -> records, crawl report dict)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    results, failed, not_modified = {}, [], []
+    start = time.perf_counter()
+
+    tasks = [_fetch_page(key, url, parse, semaphore, latencies, offline, skip_unchanged)
+             for key, url, parse in jobs]
+    for next_done in asyncio.as_completed(tasks):
+        key, records = await next_done
+        if records is NOT_MODIFIED:
+            not_modified.append(key)
+            continue
+        if isinstance(records, Exception):
+            print(f"Error crawling {key}: {records}")
+            failed.append(key)
+            continue
+        results[key] = records
+        if on_records is not None:
+            on_records(key, records)
+
+    report = crawl_report(len(tasks), failed, time.perf_counter() - start, latencies)
+    report['not_modified'] = not_modified
+    return results, report
+
+
+def crawl(jobs, on_records=None, concurrency=MAX_CONCURRENCY, offline=False, skip_unchanged=()):
+    """Synchronous entry point for crawl_async"""
+    return asyncio.run(crawl_async(jobs, on_records, concurrency, offline, skip_unchanged))
+
+
+def crawl_report(pages, failed, elapsed, latencies):
+    """Throughput and tail latency of a crawl"""
+    latencies = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+    return {
+        'pages': pages,
+        'failed': failed,
+        'elapsed': elapsed,
+        'pages_per_sec': pages / elapsed if elapsed > 0 else 0.0,
+        'latency_p50_ms': p50,
+        'latency_p95_ms': p95,
+        'latency_p99_ms': p99,
+    }
+
+
+def print_report(label, report):
+    """Print a one-line crawl summary"""
+    print(f"{label}: {report['pages']} pages ({len(report['failed'])} failed, "
+          f"{len(report.get('not_modified', []))} unchanged) in "
+          f"{report['elapsed']:.1f}s, {report['pages_per_sec']:.2f} pages/s, "
+          f"p50 {report['latency_p50_ms']:.0f}ms, p95 {report['latency_p95_ms']:.0f}ms, "
+          f"p99 {report['latency_p99_ms']:.0f}ms")
+
+
+# ============ TRANSFERMARKT CRAWLS ============
+
+def crawl_squads(teams_df, concurrency=MAX_CONCURRENCY, offline=False):
+    """
+    Crawl every team's squad page; each parsed squad is written to the cache
+    (squad_<team>) as soon as it arrives. Squads whose page is unchanged
+    (304) and already cached are not re-parsed.
+    Returns: (dict team -> squad columns, crawl report)
+    """
+    def store(team_name, columns):
+        if len(columns['player_name']):
+            scraper.save_to_cache(pd.DataFrame(columns), scraper.squad_cache_name(team_name),
+                                  source_url=urls[team_name])
+
+    urls = dict(zip(teams_df['team_name'], teams_df['team_url']))
+    jobs = [
+        (team_name, url, lambda html, team_name=team_name: scraper.parse_squad_page(html, team_name))
+        for team_name, url in urls.items()
+    ]
+    # Without a cached squad, a 304 still has to be parsed from the archive
+    skip_unchanged = {team_name for team_name in urls
+                      if scraper.cache_exists(scraper.squad_cache_name(team_name))}
+    results, report = crawl(jobs, store, concurrency, offline, skip_unchanged)
+    print_report("Squads", report)
+    return results, report
+
+
+def crawl_player_statistics(pages=STATS_PAGES, concurrency=MAX_CONCURRENCY, offline=False):
+    """
+    Crawl the paginated tournament statistics
+    Returns: (DataFrame of player statistics, crawl report)
+    """
+    jobs = [(page, f"{scraper.STATS_URL}/page/{page}", scraper.parse_player_stats_page)
+            for page in range(1, pages + 1)]
+    results, report = crawl(jobs, concurrency=concurrency, offline=offline)
+    print_report("Player statistics", report)
+    pages = [pd.DataFrame(results[page]) for page in sorted(results)]
+    return (pd.concat(pages, ignore_index=True) if pages else pd.DataFrame()), report
+
+
+def crawl_matches(concurrency=MAX_CONCURRENCY, offline=False):
+    """
+    Crawl the tournament fixtures page
+    Returns: (list of match records, crawl report)
+    """
+    results, report = crawl([('fixtures', scraper.FIXTURES_URL, scraper.parse_matches_page)],
+                            concurrency=concurrency, offline=offline)
+    print_report("Matches", report)
+    return results.get('fixtures', []), report
+
+
+def save_crawl(stats, matches):
+    """
+    Write crawled statistics and fixtures to their datasets (keeping the
+    results recorded in the cache), then expire the datasets built from
+    the squads and results so they are rebuilt from this crawl
+    """
+    with scraper.results_lock():
+        if len(stats):
+            scraper.save_to_cache(stats, 'player_stats', scraper.STATS_URL)
+        if matches:
+            fixtures = scraper.carry_over_results(pd.DataFrame(matches), scraper.get_cached_data('matches'))
+            scraper.save_to_cache(fixtures, 'matches', scraper.FIXTURES_URL)
+    scraper.invalidate_cache('players', 'team_stats')
+
+
+if __name__ == "__main__":
+    import sys
+
+    # --offline re-parses the raw archive, e.g. after a parser fix
+    offline = '--offline' in sys.argv
+    teams = scraper.get_participating_teams()
+    crawl_squads(teams, offline=offline)
+    stats, _ = crawl_player_statistics(offline=offline)
+    matches, _ = crawl_matches(offline=offline)
+    save_crawl(stats, matches)
@@ -0,0 +1,282 @@
+"""
+Live match-event ingestion for AFCON matchdays
+Tails an append-only JSONL event feed and applies each goal and card
+incrementally to in-memory player statistics, matches and team standings,
+checkpointing the hot state to the cache periodically
+
+One JSON object per line, e.g.:
+    {"type": "kickoff", "match_id": 1}
+    {"type": "goal", "match_id": 1, "team": "Morocco", "player": "Brahim Díaz", "assist": "Achraf Hakimi", "minute": 12}
+    {"type": "goal", "match_id": 1, "team": "Morocco", "player": "Nayef Aguerd", "own_goal": true, "minute": 40}
+    {"type": "yellow_card", "match_id": 1, "team": "Mali", "player": "Yves Bissouma", "minute": 55}
+    {"type": "red_card", "match_id": 1, "team": "Mali", "player": "Yves Bissouma", "minute": 80}
+    {"type": "full_time", "match_id": 1}
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import scraper
+import standings
+
+EVENT_TYPES = ('kickoff', 'goal', 'yellow_card', 'red_card', 'full_time')
+# Seconds between two checkpoints of the hot state to the cache
+CHECKPOINT_INTERVAL = 10.0
+# Seconds to wait for new lines at the end of the feed
+POLL_INTERVAL = 0.5
+CHECKPOINT_FILE = 'live_checkpoint.json'
+
+
+class LiveState:
+    """
+    In-memory player statistics, matches and team statistics, updated one
+    event at a time. Each event only touches the rows it concerns.
+    """
+
+    def __init__(self):
+        self.player_stats = scraper.get_player_statistics().copy()
+        self.matches = scraper.get_matches_and_results().copy()
+        for column in ('score_home', 'score_away'):
+            self.matches[column] = self.matches[column].astype(object)
+        self.team_stats = scraper.aggregate_team_stats().set_index('team_name')
+
+        self.player_rows = {
+            key: row for row, key in enumerate(zip(self.player_stats['team'], self.player_stats['player_name']))
+        }
+        self.match_rows = {match_id: row for row, match_id in enumerate(self.matches['match_id'])}
+        self.stat_columns = {column: self.player_stats.columns.get_loc(column)
+                             for column in ('goals', 'assists', 'yellow_cards', 'red_cards')}
+        self.match_columns = {column: self.matches.columns.get_loc(column)
+                              for column in ('score_home', 'score_away', 'status')}
+        self.dirty = set()
+        self.applied = 0
+        self.skipped = 0
+
+    # ============ EVENTS ============
+
+    def apply(self, event):
+        """Apply one event; returns False (and counts it as skipped) if it cannot be applied"""
+        handler = getattr(self, f"_on_{event.get('type')}", None) if event.get('type') in EVENT_TYPES else None
+        row = self.match_rows.get(event.get('match_id'))
+        if handler is None or row is None or handler(row, event) is False:
+            self.skipped += 1
+            return False
+        self.applied += 1
+        return True
+
+    def _score(self, row):
+        """Current (home, away) score of a match, None if it has not started"""
+        home = self.matches.iat[row, self.match_columns['score_home']]
+        away = self.matches.iat[row, self.match_columns['score_away']]
+        if pd.isna(home) or pd.isna(away):
+            return None
+        return int(home), int(away)
+
+    def _set_score(self, row, score):
+        """Replace a match score, moving a group stage result in the standings"""
+        match = self.matches.iloc[row]
+        previous = self._score(row)
+        if match['phase'] == standings.GROUP_STAGE:
+            if previous is not None:
+                standings.apply_result(self.team_stats, match['team_home'], match['team_away'], *previous, sign=-1)
+            standings.apply_result(self.team_stats, match['team_home'], match['team_away'], *score)
+        self.matches.iat[row, self.match_columns['score_home']] = score[0]
+        self.matches.iat[row, self.match_columns['score_away']] = score[1]
+        self.dirty.update(('matches', 'team_stats'))
+
+    def _set_status(self, row, status):
+        self.matches.iat[row, self.match_columns['status']] = status
+        self.dirty.add('matches')
+
+    def _add_to_player(self, team, player, column):
+        """Increment one statistic of a player; unknown players are ignored"""
+        row = self.player_rows.get((team, player))
+        if row is None:
+            return
+        self.player_stats.iat[row, self.stat_columns[column]] += 1
+        self.dirty.add('player_stats')
+
+    def _on_kickoff(self, row, event):
+        if self._score(row) is None:
+            self._set_score(row, (0, 0))
+        self._set_status(row, 'Live')
+
+    def _on_goal(self, row, event):
+        match = self.matches.iloc[row]
+        sides = (match['team_home'], match['team_away'])
+        if event.get('team') not in sides:
+            return False
+        home, away = self._score(row) or (0, 0)
+        # An own goal is listed under the player's team and counts for the other side
+        scores_home = (event['team'] == sides[0]) != bool(event.get('own_goal'))
+        self._set_score(row, (home + 1, away) if scores_home else (home, away + 1))
+        if match['status'] != 'Live':
+            self._set_status(row, 'Live')
+        if not event.get('own_goal'):
+            self._add_to_player(event['team'], event.get('player'), 'goals')
+            if event.get('assist'):
+                self._add_to_player(event['team'], event['assist'], 'assists')
+
+    def _on_yellow_card(self, row, event):
+        self._add_to_player(event.get('team'), event.get('player'), 'yellow_cards')
+
+    def _on_red_card(self, row, event):
+        self._add_to_player(event.get('team'), event.get('player'), 'red_cards')
+
+    def _on_full_time(self, row, event):
+        if self._score(row) is None:
+            return False
+        self._set_status(row, 'Finished')
+
+    # ============ CHECKPOINTS ============
+
+    def checkpoint(self, feed, offset):
+        """
+        Write the datasets changed since the last checkpoint, then the feed
+        offset they include (None for an unseekable feed). A crash in
+        between replays the events read since the previous checkpoint.
+        Written under the results lock of record_match_result, after taking
+        in the results it recorded meanwhile.
+        """
+        with scraper.results_lock():
+            self._adopt_recorded_results()
+            if 'player_stats' in self.dirty:
+                scraper.save_to_cache(self.player_stats, 'player_stats', scraper.STATS_URL)
+            if 'matches' in self.dirty:
+                scraper.save_to_cache(self.matches, 'matches', scraper.FIXTURES_URL)
+            if 'team_stats' in self.dirty:
+                scraper.save_to_cache(self.team_stats.reset_index(), 'team_stats')
+        self.dirty.clear()
+        if offset is not None:
+            save_checkpoint(feed, offset)
+
+    def _adopt_recorded_results(self):
+        """
+        Take the results cached by another writer (record_match_result)
+        for matches this state has no score for, so writing it back does
+        not erase them
+        """
+        recorded = scraper.get_cached_data('matches')
+        merged = scraper.carry_over_results(self.matches, recorded)
+        if merged is self.matches:
+            return
+        taken = self.matches['score_home'].isna().to_numpy() & merged['score_home'].notna().to_numpy()
+        for row in np.flatnonzero(taken):
+            self._set_score(row, (int(merged['score_home'].iat[row]), int(merged['score_away'].iat[row])))
+            self._set_status(row, merged['status'].iat[row])
+
+
+def _checkpoint_path():
+    return os.path.join(scraper.CACHE_DIR, CHECKPOINT_FILE)
+
+
+def load_checkpoint(feed):
+    """Feed offset already applied to the cache, 0 for a new feed"""
+    try:
+        with open(_checkpoint_path(), 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if checkpoint.get('feed') != os.path.abspath(feed):
+        return 0
+    return checkpoint.get('offset', 0)
+
+
+def save_checkpoint(feed, offset):
+    """Record the feed offset, atomically"""
+    path = _checkpoint_path()
+    os.makedirs(scraper.CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'feed': os.path.abspath(feed), 'offset': offset, 'updated_at': time.time()}, f)
+    os.replace(tmp, path)
+
+
+# ============ FEED ============
+
+def follow(stream, wait=True, poll_interval=POLL_INTERVAL):
+    """
+    Yield (event, offset after it) for each complete line of a JSONL
+    stream; with wait, keep polling for lines appended after the end,
+    yielding (None, None) on each idle poll so the caller can checkpoint
+    A line still being written (no trailing newline) is read again later
+    """
+    while True:
+        position = stream.tell() if stream.seekable() else None
+        line = stream.readline()
+        if line.endswith('\n'):
+            event = _parse_event(line)
+            if event is not None:
+                yield event, (stream.tell() if position is not None else None)
+            continue
+        if position is None:
+            # Unseekable stream (socket, pipe): readline only returns a partial line at EOF
+            event = _parse_event(line)
+            if event is not None:
+                yield event, None
+            return
+        stream.seek(position)
+        if not wait:
+            return
+        yield None, None
+        time.sleep(poll_interval)
+
+
+def _parse_event(line):
+    """Event dict of a feed line, None for a blank or malformed line (JSON that is not an object included)"""
+    if not line.strip():
+        return None
+    try:
+        event = json.loads(line)
+    except ValueError:
+        event = None
+    if not isinstance(event, dict):
+        print(f"Skipping malformed event: {line.strip()[:80]}")
+        return None
+    return event
+
+
+def ingest(feed, follow_feed=True, checkpoint_interval=CHECKPOINT_INTERVAL):
+    """
+    Apply a JSONL feed (a path, or '-' for stdin) to the live state,
+    resuming a file after its last checkpoint
+    Returns: LiveState
+    """
+    state = LiveState()
+    from_stdin = feed == '-'
+    stream = sys.stdin if from_stdin else open(feed, 'r', encoding='utf-8')
+    offset = None if from_stdin else load_checkpoint(feed)
+    if offset:
+        stream.seek(offset)
+    last_checkpoint = time.monotonic()
+    try:
+        for event, position in follow(stream, follow_feed):
+            if event is not None:
+                state.apply(event)
+            if position is not None and not from_stdin:
+                offset = position
+            # Also reached on idle polls: the last events before a quiet spell are written too
+            if time.monotonic() - last_checkpoint >= checkpoint_interval and state.dirty:
+                state.checkpoint(feed, offset)
+                last_checkpoint = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        state.checkpoint(feed, offset)
+        if not from_stdin:
+            stream.close()
+    print(f"Live ingestion: {state.applied} events applied, {state.skipped} skipped")
+    return state
+
+
+if __name__ == "__main__":
+    # python live.py events.jsonl [--once]    ('-' reads stdin, e.g. from a socket)
+    if len(sys.argv) < 2:
+        print("Usage: python live.py <feed.jsonl | -> [--once]")
+        sys.exit(1)
+    ingest(sys.argv[1], follow_feed='--once' not in sys.argv)
@@ -0,0 +1,129 @@
+"""
+In-process memoization for data accessors
+LRU cache keyed by function arguments plus a data version, bounded in
+entries and bytes, with hit/miss counters and explicit invalidation
+"""
+
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+MAX_ENTRIES = 256
+MAX_BYTES = 256 * 1024 * 1024
+# Entries older than this are recomputed, so accessors get to re-check freshness
+MAX_AGE = 60.0
+
+
+def approximate_size(value):
+    """Shallow memory footprint of a cached value, in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, Mapping):  # dicts, and DatasetBundle
+        return sys.getsizeof(value) + sum(approximate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(approximate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU mapping bounded by entry count and total size"""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, size, stored_at, owner)
+        self.bytes = 0
+        self.counters = {}  # owner -> {'hits', 'misses', 'evictions'}
+        self.lock = threading.Lock()
+
+    def _count(self, owner, counter):
+        self.counters.setdefault(owner, {'hits': 0, 'misses': 0, 'evictions': 0})[counter] += 1
+
+    def get(self, key, owner, max_age=None):
+        """Returns (True, value) on a hit, (False, None) on a miss"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and (max_age is None or time.monotonic() - entry[2] < max_age):
+                self.entries.move_to_end(key)
+                self._count(owner, 'hits')
+                return True, entry[0]
+            self._count(owner, 'misses')
+            return False, None
+
+    def put(self, key, value, owner):
+        """Store a value, evicting least recently used entries beyond the bounds"""
+        size = approximate_size(value)
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size, time.monotonic(), owner)
+            self.bytes += size
+            while len(self.entries) > 1 and (len(self.entries) > self.max_entries
+                                            or self.bytes > self.max_bytes):
+                _, (_, evicted_size, _, evicted_owner) = self.entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self._count(evicted_owner, 'evictions')
+
+    def clear(self, owner=None):
+        """Drop every entry, or only those of one owner"""
+        with self.lock:
+            for key in [k for k, e in self.entries.items() if owner is None or e[3] == owner]:
+                self.bytes -= self.entries.pop(key)[1]
+
+    def stats(self):
+        """Counters per owner plus current size"""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'functions': {owner: dict(c) for owner, c in self.counters.items()},
+            }
+
+
+_cache = LRUCache()
+
+
+def memoize(version, max_age=MAX_AGE):
+    """
+    Memoize a function on its arguments plus `version()`, a cheap token
+    identifying the data it reads (e.g. cache file stamps). The version is
+    taken again after a miss, so a call that builds its data is stored
+    under the new version.
+    """
+    def decorator(func):
+        owner = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            arguments = (args, tuple(sorted(kwargs.items())))
+            found, value = _cache.get((owner, arguments, version()), owner, max_age)
+            if found:
+                return value
+            value = func(*args, **kwargs)
+            _cache.put((owner, arguments, version()), value, owner)
+            return value
+
+        wrapper.uncached = func
+        wrapper.invalidate = lambda: _cache.clear(owner)
+        return wrapper
+    return decorator
+
+
+def invalidate(owner=None):
+    """Drop memoized results of every function, or of one (module.qualname)"""
+    _cache.clear(owner)
+
+
+def stats():
+    """Hit/miss/eviction counters per memoized function, entry count and bytes"""
+    return _cache.stats()
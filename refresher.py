@@ -0,0 +1,161 @@
+"""
+Background refresh of the dashboard data
+Rebuilds expired datasets on a schedule, outside of Streamlit request
+handling, and publishes them as immutable snapshots
+(cache/snapshots/<version>/) behind a CURRENT pointer swapped atomically:
+readers always get a complete set and never wait for a build
+"""
+
+import os
+import shutil
+import sys
+import threading
+import time
+
+import pyarrow.feather as feather
+
+import schema
+import scraper
+from bundle import DatasetBundle
+
+SNAPSHOT_DIR = 'snapshots'
+CURRENT_FILE = 'CURRENT'
+# Seconds between two refresh rounds (the matchday TTL of the results)
+REFRESH_INTERVAL = scraper.MATCHDAY_TTL
+# Seconds between two checks for results written by live.py or record_match_result
+RESULTS_POLL_INTERVAL = 2.0
+# Older snapshots are kept for readers that still map them
+KEEP_SNAPSHOTS = 3
+# Datasets of scraper.load_all_data stored in a snapshot
+SNAPSHOT_DATASETS = ('teams', 'players', 'player_stats', 'matches', 'team_stats')
+# Set when `python refresher.py` runs as its own process: the app then
+# does not start a refresher thread
+EXTERNAL_REFRESHER = os.environ.get('AFCON_EXTERNAL_REFRESHER') == '1'
+
+
+def _snapshot_root():
+    return os.path.join(scraper.CACHE_DIR, SNAPSHOT_DIR)
+
+
+def current_version():
+    """Version of the latest published snapshot, None before the first one"""
+    try:
+        with open(os.path.join(_snapshot_root(), CURRENT_FILE), 'r', encoding='utf-8') as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    return version if version and os.path.isdir(os.path.join(_snapshot_root(), version)) else None
+
+
+def read_snapshot(version=None):
+    """
+    Load a published snapshot (the current one by default), memory-mapped
+    Returns: DatasetBundle versioned by the snapshot version, None if nothing is published
+    """
+    version = version or current_version()
+    if version is None:
+        return None
+    directory = os.path.join(_snapshot_root(), version)
+    data = {
+        name: schema.apply(name, feather.read_table(os.path.join(directory, name + scraper.CACHE_FORMAT),
+                                                    memory_map=True).to_pandas())
+        for name in SNAPSHOT_DATASETS
+    }
+    data['matches_index'] = scraper.build_matches_index(data['matches'])
+    data['standings_index'] = scraper.build_standings_index(data['team_stats'], data['matches'])
+    # The snapshot version already ends with the bundle's content hash
+    return DatasetBundle(data, version)
+
+
+def publish_snapshot():
+    """
+    Write the current cached datasets to a new snapshot directory and point
+    CURRENT at it. Nothing is published if the content did not change.
+    Returns: version of the current snapshot
+    """
+    root = _snapshot_root()
+    os.makedirs(root, exist_ok=True)
+    with scraper.results_lock():  # Never a live checkpoint half written
+        data = scraper.load_all_data()
+    content = data.version[:12]
+    current = current_version()
+    if current is not None and current.endswith(content):
+        return current
+
+    tmp_dir = os.path.join(root, f".tmp-{os.getpid()}-{threading.get_ident()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name in SNAPSHOT_DATASETS:
+        feather.write_feather(data[name].reset_index(drop=True),
+                              os.path.join(tmp_dir, name + scraper.CACHE_FORMAT), compression='uncompressed')
+
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{content}"
+    os.rename(tmp_dir, os.path.join(root, version))
+    pointer = os.path.join(root, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+    with open(pointer, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(root, CURRENT_FILE))
+    _prune_snapshots(keep=version)
+    return version
+
+
+def _prune_snapshots(keep):
+    """Delete all but the KEEP_SNAPSHOTS most recent snapshots (files still mapped stay readable)"""
+    versions = sorted(v for v in os.listdir(_snapshot_root())
+                      if not v.startswith('.') and os.path.isdir(os.path.join(_snapshot_root(), v)))
+    for version in versions[:-KEEP_SNAPSHOTS]:
+        if version != keep:
+            shutil.rmtree(os.path.join(_snapshot_root(), version), ignore_errors=True)
+
+
+def refresh_once():
+    """Rebuild expired datasets, then publish them; returns the current version"""
+    rebuilt = scraper.refresh_datasets()
+    if rebuilt:
+        print(f"Refreshed: {', '.join(rebuilt)}")
+    return publish_snapshot()
+
+
+def run(interval=REFRESH_INTERVAL, stop=None, poll_interval=RESULTS_POLL_INTERVAL):
+    """
+    Refresh every `interval` seconds until `stop` (a threading.Event) is
+    set; in between, publish within `poll_interval` seconds any results
+    written to the cache (live ingestion, recorded results)
+    """
+    stop = stop or threading.Event()
+    next_refresh = 0.0
+    stamp = None
+    while not stop.is_set():
+        try:
+            # Stamp taken first: a result written during the publish is published next time
+            previous, stamp = stamp, scraper.results_stamp()
+            if time.monotonic() >= next_refresh:
+                next_refresh = time.monotonic() + interval
+                refresh_once()
+            elif stamp != previous:
+                publish_snapshot()
+        except Exception as e:
+            print(f"Error refreshing data: {e}")
+        stop.wait(poll_interval)
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def start_background_refresher(interval=REFRESH_INTERVAL):
+    """Start the refresher in a daemon thread, once per process"""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=run, args=(interval,), name="afcon-refresher", daemon=True)
+            _refresher.start()
+    return _refresher
+
+
+if __name__ == "__main__":
+    # python refresher.py [--once]   (run the app with AFCON_EXTERNAL_REFRESHER=1)
+    if '--once' in sys.argv:
+        print(f"Published snapshot {refresh_once()}")
+    else:
+        run()
@@ -0,0 +1,134 @@
+"""
+Column dtypes of the scraper datasets
+Repeated strings become categoricals, counts narrow integers and scores
+nullable integers; every scraper.get_* result goes through apply()
+"""
+
+import numpy as np
+import pandas as pd
+
+MATCH_STATUSES = ['Scheduled', 'Live', 'Finished']
+
+# dataset -> {column: dtype}. 'category' takes its categories from the data;
+# a list gives categories that are always present, for values set after
+# loading (e.g. a match going live). Integer widths are a floor: a column
+# whose values do not fit is widened, never wrapped.
+SCHEMAS = {
+    'teams': {
+        'group': 'category',
+    },
+    'players': {
+        'number': 'int8',
+        'position': 'category',
+        'age': 'int8',
+        'club': 'category',
+        'market_value': 'int32',
+        'nationality': 'category',
+    },
+    'player_stats': {
+        'team': 'category',
+        'position': 'category',
+        'games_played': 'int8',
+        'minutes_played': 'int16',
+        'goals': 'int8',
+        'assists': 'int8',
+        'yellow_cards': 'int8',
+        'red_cards': 'int8',
+    },
+    'matches': {
+        'match_id': 'int32',
+        'phase': 'category',
+        'group': 'category',
+        'team_home': 'category',
+        'team_away': 'category',
+        'score_home': 'Int8',
+        'score_away': 'Int8',
+        'status': MATCH_STATUSES,
+    },
+    'team_stats': {
+        'group': 'category',
+        'matches_played': 'int8',
+        'wins': 'int8',
+        'draws': 'int8',
+        'losses': 'int8',
+        'goals_scored': 'int16',
+        'goals_conceded': 'int16',
+        'goal_difference': 'int16',
+        'points': 'int16',
+        'avg_age': 'float32',
+        'total_players': 'int8',
+    },
+}
+# Columns of one dataset that hold the same values share their categories,
+# so they can be compared with each other
+SHARED_CATEGORIES = {
+    'matches': [('team_home', 'team_away')],
+}
+
+_INTEGER_WIDTHS = ['int8', 'int16', 'int32', 'int64']
+
+
+def _integer_dtype(values, dtype):
+    """
+    `dtype`, or the first wider integer type that holds every value;
+    nullable (Int*) if the schema asks for it or values are missing
+    """
+    missing = np.isnan(values)
+    nullable = dtype[0] == 'I' or missing.any()
+    valid = values[~missing]
+    low, high = (valid.min(), valid.max()) if len(valid) else (0, 0)
+    for width in _INTEGER_WIDTHS[_INTEGER_WIDTHS.index(dtype.lower()):]:
+        info = np.iinfo(width)
+        if info.min <= low and high <= info.max:
+            return width.capitalize() if nullable else width
+    return 'Int64' if nullable else 'int64'
+
+
+def _convert(column, dtype):
+    """One column converted to a schema dtype"""
+    if isinstance(dtype, list):
+        observed = column.dropna().unique().tolist()
+        return column.astype(pd.CategoricalDtype(dtype + sorted(set(observed) - set(dtype))))
+    if dtype == 'category':
+        return column if isinstance(column.dtype, pd.CategoricalDtype) else column.astype('category')
+    if dtype.lower().startswith('int'):
+        numbers = pd.to_numeric(column)
+        return numbers.astype(_integer_dtype(numbers.to_numpy(dtype=np.float64, na_value=np.nan), dtype))
+    return column.astype(dtype)
+
+
+def apply(name, df):
+    """
+    A copy of dataset `name` with its schema dtypes; columns the schema
+    does not list (and datasets without a schema) are left as they are
+    """
+    schema = SCHEMAS.get(name)
+    if schema is None or df is None:
+        return df
+    df = df.copy()
+    for column, dtype in schema.items():
+        if column in df.columns:
+            df[column] = _convert(df[column], dtype)
+    for columns in SHARED_CATEGORIES.get(name, []):
+        categories = sorted(set().union(*(df[c].cat.categories for c in columns if c in df.columns)))
+        for column in columns:
+            if column in df.columns:
+                df[column] = df[column].cat.set_categories(categories)
+    return df
+
+
+def memory_report(frames):
+    """
+    Deep memory footprint of each dataset before and after its schema
+    frames: {name: DataFrame}
+    Returns: DataFrame with rows, before/after bytes and reduction factor
+    """
+    rows = []
+    for name, df in frames.items():
+        if not isinstance(df, pd.DataFrame):
+            continue
+        before = int(df.memory_usage(index=True, deep=True).sum())
+        after = int(apply(name, df).memory_usage(index=True, deep=True).sum())
+        rows.append({'dataset': name, 'rows': len(df), 'before_bytes': before,
+                     'after_bytes': after, 'reduction': before / after if after else 1.0})
+    return pd.DataFrame(rows)
@@ -4,18 +4,86 @@ Handles all web scraping operations with rate limiting and caching
 """
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
 import pandas as pd
+import numpy as np
 import time
 import json
 import os
 from datetime import datetime
 import re
+import hashlib
+import functools
+import gzip
+import threading
+import random
+from urllib.parse import urlparse
+import contextlib
+import numbers
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, only atomic replaces
+    fcntl = None
+
+import memo
+import schema
+import standings
+from bundle import DatasetBundle
 
 # Configuration
 BASE_URL = "https://www.transfermarkt.com"
 AFCON_URL = f"{BASE_URL}/africa-cup-of-nations/startseite/pokalwettbewerb/AFCN"
+STATS_URL = f"{BASE_URL}/africa-cup-of-nations/leistungsdaten/pokalwettbewerb/AFCN"
+FIXTURES_URL = f"{BASE_URL}/africa-cup-of-nations/gesamtspielplan/pokalwettbewerb/AFCN"
 CACHE_DIR = "cache"
+CACHE_FORMAT = ".arrow"  # Arrow IPC (Feather v2); ".json" is only read as a legacy import
+MANIFEST_FILE = "manifest.json"
+RAW_ARCHIVE_DIR = "raw"  # Compressed raw responses, inside CACHE_DIR
+LOCK_DIR = "locks"  # Advisory lock files shared by processes, inside CACHE_DIR
+# Datasets holding recorded results (record_match_result, live.py): rebuilt
+# and written under the 'results' lock so no writer loses another's changes
+RESULT_DATASETS = ('player_stats', 'matches', 'team_stats')
+
+# Reproducibility contract: every synthetic dataset is a pure function of
+# DATASET_VERSION and its inputs, seeded through stable_seed() and never
+# through Python's per-process salted hash(). Any process or node therefore
+# generates byte-identical cache files, which can be shared between replicas
+# and memoized by content hash. Bump DATASET_VERSION whenever a generator
+# changes its output; cache entries written under another version are stale.
+DATASET_VERSION = 1
+
+# Crawl Transfermarkt instead of generating squads, statistics and fixtures
+LIVE_SCRAPE = os.environ.get('AFCON_LIVE_SCRAPE') == '1'
+
+# Freshness budget per dataset, in seconds (squad_* datasets use 'squad')
+CACHE_TTL = {
+    'teams': 7 * 24 * 3600,
+    'squad': 24 * 3600,
+    'player_stats': 6 * 3600,
+    'matches': 6 * 3600,
+    'team_stats': 6 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+# Datasets that change with results: refreshed every few minutes on matchdays
+MATCHDAY_TTL = 5 * 60
+MATCHDAY_DATASETS = {'matches', 'player_stats', 'team_stats'}
+TOURNAMENT_START = "2025-12-21"
+TOURNAMENT_END = "2026-01-18"
+
+# Politeness budget per host: sustained request rate and burst size
+RATE_LIMIT_PER_SECOND = 0.5  # One request every 2 seconds on average
+RATE_LIMIT_BURST = 3
+POOL_SIZE = 10
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
@@ -24,67 +92,689 @@ HEADERS = {
 os.makedirs(CACHE_DIR, exist_ok=True)
 
 
+def _dataset_name(cache_file):
+    """Map a cache file name ('teams.json' or 'teams') to its dataset name"""
+    for ext in (CACHE_FORMAT, '.json'):
+        if cache_file.endswith(ext):
+            return cache_file[:-len(ext)]
+    return cache_file
+
+
+def _cache_path(name, ext=CACHE_FORMAT):
+    """Path of a dataset file inside the cache directory"""
+    return os.path.join(CACHE_DIR, f"{name}{ext}")
+
+
+def _cache_stamp(*cache_files):
+    """
+    Data version of cached datasets from their file metadata (None if
+    missing): detects a replaced file without reading it
+    """
+    stamps = []
+    for cache_file in cache_files:
+        try:
+            stat = os.stat(_cache_path(_dataset_name(cache_file)))
+            stamps.append((stat.st_mtime_ns, stat.st_ino, stat.st_size))
+        except OSError:
+            stamps.append(None)
+    return (CACHE_DIR,) + tuple(stamps)
+
+
+def cache_exists(cache_file):
+    """True if the dataset has been cached in the columnar format"""
+    return os.path.exists(_cache_path(_dataset_name(cache_file)))
+
+
 def get_cached_data(cache_file):
-    """Load data from cache if available and recent"""
-    cache_path = os.path.join(CACHE_DIR, cache_file)
-    if os.path.exists(cache_path):
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    """
+    Load a cached dataset as a DataFrame, or None if it was never cached.
+    The columnar Arrow file is memory-mapped; a legacy JSON cache is imported
+    once and converted to the columnar format.
+    Freshness is not checked here, see is_cache_fresh().
+    """
+    name = _dataset_name(cache_file)
+    arrow_path = _cache_path(name)
+    if os.path.exists(arrow_path):
+        return feather.read_table(arrow_path, memory_map=True).to_pandas()
+
+    legacy_path = _cache_path(name, '.json')
+    if os.path.exists(legacy_path):
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            df = pd.DataFrame(json.load(f))
+        save_to_cache(df, name, fetched_at=os.path.getmtime(legacy_path))
+        return df
     return None
 
 
-def save_to_cache(data, cache_file):
-    """Save data to cache"""
-    cache_path = os.path.join(CACHE_DIR, cache_file)
-    with open(cache_path, 'w', encoding='utf-8') as f:
+def save_to_cache(data, cache_file, source_url=None, fetched_at=None):
+    """Save a DataFrame (or list of records) to the columnar cache and record it in the manifest"""
+    name = _dataset_name(cache_file)
+    df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    path = _cache_path(name)
+    # Uncompressed Arrow IPC so reads can map the file instead of decoding it.
+    # Written aside then swapped in: frames loaded earlier still map the old
+    # file, truncating it in place would crash them (SIGBUS)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+    _record_manifest_entry(name, path, source_url, fetched_at)
+
+
+def _write_json_atomic(path, data):
+    """Write a JSON file aside then swap it in, so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+_held_locks = threading.local()
+
+
+@contextlib.contextmanager
+def _file_lock(name, blocking=True):
+    """
+    Advisory lock shared by every process using CACHE_DIR (fcntl.flock on
+    locks/<name>.lock). Yields True once held; with blocking=False, yields
+    False right away if another holder has it. Readers never take it.
+    Reentrant within a thread: a nested request for a lock the thread
+    already holds yields True at once.
+    """
+    held = _held_locks.__dict__.setdefault('names', set())
+    if name in held:
+        yield True
+        return
+    lock_dir = os.path.join(CACHE_DIR, LOCK_DIR)
+    os.makedirs(lock_dir, exist_ok=True)
+    with open(os.path.join(lock_dir, f"{name}.lock"), 'a') as f:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        held.add(name)
+        try:
+            yield True
+        finally:
+            held.discard(name)
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def results_lock():
+    """Lock held while reading and rewriting the RESULT_DATASETS"""
+    return _file_lock('results')
+
+
+def results_stamp():
+    """Data version of the RESULT_DATASETS files: changes with every write of a result"""
+    return _cache_stamp(*RESULT_DATASETS)
+
+
+@contextlib.contextmanager
+def _rebuild_lock(name, blocking=True):
+    """
+    Lock held while rebuilding a dataset: its own, preceded by the
+    'results' lock for RESULT_DATASETS (always in that order, so two
+    holders never wait on each other). Yields like _file_lock.
+    """
+    if name not in RESULT_DATASETS:
+        with _file_lock(name, blocking) as held:
+            yield held
+        return
+    with _file_lock('results', blocking) as results_held:
+        if not results_held:
+            yield False
+            return
+        with _file_lock(name, blocking) as held:
+            yield held
+
+
+# ============ CACHE MANIFEST & FRESHNESS ============
+
+_manifest_lock = threading.Lock()
+_refreshing = set()
+
+
+def _load_manifest():
+    """Read the cache manifest ({dataset: entry}), empty if missing or unreadable"""
+    try:
+        with open(os.path.join(CACHE_DIR, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _file_digest(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _record_manifest_entry(name, path, source_url=None, fetched_at=None):
+    """Record fetch time, source URL, content hash and TTL of a cached dataset"""
+    entry = {
+        'fetched_at': fetched_at if fetched_at is not None else time.time(),
+        'source_url': source_url,
+        'content_hash': _file_digest(path),
+        'ttl': cache_ttl(name),
+        'dataset_version': DATASET_VERSION,
+    }
+    with _manifest_lock, _file_lock('manifest'):
+        manifest = _load_manifest()
+        manifest[name] = entry
+        _write_json_atomic(os.path.join(CACHE_DIR, MANIFEST_FILE), manifest)
+
+
+def is_matchday(now=None):
+    """True while the tournament is being played"""
+    today = datetime.fromtimestamp(now if now is not None else time.time()).strftime('%Y-%m-%d')
+    return TOURNAMENT_START <= today <= TOURNAMENT_END
+
+
+def cache_ttl(name, now=None):
+    """Time-to-live in seconds of a cached dataset"""
+    if name in MATCHDAY_DATASETS and is_matchday(now):
+        return MATCHDAY_TTL
+    key = 'squad' if name.startswith('squad_') else name
+    return CACHE_TTL.get(key, DEFAULT_TTL)
+
+
+def is_cache_fresh(cache_file, now=None):
+    """True if the dataset is cached and younger than its TTL"""
+    name = _dataset_name(cache_file)
+    entry = _load_manifest().get(name)
+    if entry is None or not os.path.exists(_cache_path(name)):
+        return False
+    if entry.get('dataset_version') != DATASET_VERSION:
+        return False
+    now = now if now is not None else time.time()
+    return now - entry['fetched_at'] < cache_ttl(name, now)
+
+
+def invalidate_cache(*cache_files):
+    """Mark datasets (all if none given) as expired; they are served stale until refreshed"""
+    with _manifest_lock, _file_lock('manifest'):
+        manifest = _load_manifest()
+        names = [_dataset_name(f) for f in cache_files] or list(manifest)
+        for name in names:
+            if name in manifest:
+                manifest[name]['fetched_at'] = 0
+        _write_json_atomic(os.path.join(CACHE_DIR, MANIFEST_FILE), manifest)
+    memo.invalidate()
+
+
+def _refresh_in_background(name, build, source_url=None):
+    """
+    Rebuild a dataset in a daemon thread, at most one refresh per dataset
+    at a time across threads and processes
+    """
+    with _manifest_lock:
+        if name in _refreshing:
+            return
+        _refreshing.add(name)
+
+    def run():
+        try:
+            with _rebuild_lock(name, blocking=False) as held:
+                # Skipped if another process is rebuilding it or just did
+                if held and not is_cache_fresh(name):
+                    save_to_cache(build(), name, source_url)
+        except Exception as e:
+            print(f"Error refreshing {name}: {e}")
+        finally:
+            with _manifest_lock:
+                _refreshing.discard(name)
+
+    threading.Thread(target=run, name=f"refresh-{name}", daemon=True).start()
+
+
+def _load_dataset(name, build, source_url=None):
+    """
+    Stale-while-revalidate access to a cached dataset.
+    Fresh entries are returned as is; expired entries are returned immediately
+    while a single background refresh runs; missing entries are built inline
+    by one process while the others wait for its result (single-flight).
+    Returns: DataFrame with the dtypes of schema.SCHEMAS[name]
+    """
+    cached = get_cached_data(name)
+    if cached is not None:
+        if not is_cache_fresh(name):
+            _refresh_in_background(name, build, source_url)
+        return schema.apply(name, cached)
+
+    with _rebuild_lock(name):
+        cached = get_cached_data(name)  # Built by another process while we waited
+        if cached is not None:
+            return schema.apply(name, cached)
+        df = build()
+        save_to_cache(df, name, source_url)
+    return schema.apply(name, df)
+
+
+def refresh_datasets(force=False):
+    """
+    Rebuild expired datasets inline, in dependency order (stale entries
+    are not served here: this is meant for the background refresher)
+    Returns: list of the dataset names rebuilt
+    """
+    rebuilt = []
+    for name, build, source_url in (
+        ('teams', _build_participating_teams, AFCON_URL),
+        ('players', _build_all_players, AFCON_URL),
+        ('player_stats', _build_player_statistics, STATS_URL),
+        ('matches', _build_matches_and_results, FIXTURES_URL),
+        ('team_stats', _build_team_stats, None),
+    ):
+        with _rebuild_lock(name):
+            if force or not is_cache_fresh(name):
+                save_to_cache(build(), name, source_url)
+                rebuilt.append(name)
+    return rebuilt
 
 
-def safe_request(url, delay=2):
-    """Make a safe request with error handling and delay"""
+# ============ HTTP SESSION & RATE LIMITING ============
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `burst` stored"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available; returns the time waited in seconds"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+_session = None
+_session_lock = threading.Lock()
+_host_buckets = {}
+_jitter = random.Random()  # Independent of the seeded generators used for synthetic data
+
+
+def get_session():
+    """Shared keep-alive HTTP session with a connection pool"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update(HEADERS)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+
+def _host_bucket(url):
+    """Token bucket enforcing the politeness budget of the URL's host"""
+    host = urlparse(url).netloc
+    with _session_lock:
+        if host not in _host_buckets:
+            _host_buckets[host] = TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+        return _host_buckets[host]
+
+
+def _backoff_delay(attempt, response=None):
+    """Exponential backoff with full jitter, honouring a numeric Retry-After header"""
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(BACKOFF_MAX, float(retry_after))
+    return _jitter.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+# ============ RAW RESPONSE ARCHIVE ============
+
+_archive_lock = threading.Lock()
+
+
+def _archive_dir():
+    """Directory of the raw HTML archive inside the cache"""
+    return os.path.join(CACHE_DIR, RAW_ARCHIVE_DIR)
+
+
+def _load_archive_index():
+    """Archive index: {url: {sha256, etag, last_modified, encoding, fetched_at}}"""
     try:
-        time.sleep(delay)  # Respectful scraping
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        return response
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
+        with open(os.path.join(_archive_dir(), 'index.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _archive_object_path(digest):
+    """Path of a gzip-compressed archived body, addressed by its SHA-256"""
+    return os.path.join(_archive_dir(), 'objects', digest[:2], f"{digest}.html.gz")
+
+
+def archive_response(url, response):
+    """Store a response body in the archive and remember its validators"""
+    digest = hashlib.sha256(response.content).hexdigest()
+    path = _archive_object_path(digest)
+    if not os.path.exists(path):  # Identical pages share one object
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(response.content))
+        os.replace(tmp_path, path)
+
+    with _archive_lock, _file_lock('archive'):
+        index = _load_archive_index()
+        index[url] = {
+            'sha256': digest,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'encoding': response.encoding,
+            'fetched_at': time.time(),
+        }
+        os.makedirs(_archive_dir(), exist_ok=True)
+        _write_json_atomic(os.path.join(_archive_dir(), 'index.json'), index)
+
+
+def archived_html(url):
+    """Last archived HTML of a URL, or None; never touches the network"""
+    entry = _load_archive_index().get(url)
+    if entry is None or not os.path.exists(_archive_object_path(entry['sha256'])):
         return None
+    with open(_archive_object_path(entry['sha256']), 'rb') as f:
+        return gzip.decompress(f.read()).decode(entry['encoding'] or 'utf-8', errors='replace')
+
+
+def _archived_response(response, entry):
+    """Turn a 304 response into one carrying the archived body"""
+    with open(_archive_object_path(entry['sha256']), 'rb') as f:
+        response._content = gzip.decompress(f.read())
+    response.encoding = entry['encoding']
+    return response
+
+
+def safe_request(url, revalidate=True):
+    """
+    Make a safe request through the shared session.
+    Requests are spaced by the per-host token bucket, and 429/5xx responses
+    or connection errors are retried with exponential backoff.
+    Bodies are archived; with revalidate, an archived URL is fetched with
+    If-None-Match/If-Modified-Since and a 304 is answered from the archive
+    (status_code stays 304 so callers can skip re-parsing).
+    Returns: Response, or None if every attempt failed
+    """
+    session = get_session()
+    bucket = _host_bucket(url)
+    entry = _load_archive_index().get(url) if revalidate else None
+    if entry is not None and not os.path.exists(_archive_object_path(entry['sha256'])):
+        entry = None
+    conditional = {}
+    if entry is not None:
+        if entry.get('etag'):
+            conditional['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            conditional['If-Modified-Since'] = entry['last_modified']
+
+    for attempt in range(MAX_RETRIES + 1):
+        bucket.acquire()  # Respectful scraping
+        response = None
+        try:
+            response = session.get(url, headers=conditional, timeout=10)
+            if response.status_code == 304 and entry is not None:
+                return _archived_response(response, entry)
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                archive_response(url, response)
+                return response
+            error = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            if response is not None:  # Non-retryable HTTP error
+                print(f"Error fetching {url}: {e}")
+                return None
+            error = e
+        if attempt < MAX_RETRIES:
+            time.sleep(_backoff_delay(attempt, response))
+    print(f"Error fetching {url}: {error}")
+    return None
+
+
+# Market value suffixes (Transfermarkt English and German pages) -> multiplier
+VALUE_UNITS = {
+    'bn': 1e9, 'mrd': 1e9,
+    'm': 1e6, 'mio': 1e6,
+    'k': 1e3, 'th': 1e3, 'tsd': 1e3,
+}
+# Run as Arrow compute kernels (RE2 syntax, whose \s leaves out the
+# non-breaking space): an unmatched optional group gives an empty string
+_VALUE_PATTERN = (
+    r'(?i)^[\s\x{a0}]*[€£$]?[\s\x{a0}]*(?P<number>\d+(?:[.,]\d+)*)[\s\x{a0}]*'
+    r'(?P<unit>bn|mrd|mio|m|k|th|tsd)?\.?[\s\x{a0}]*[€£$]?[\s\x{a0}]*$'
+)
+_GROUPED_NUMBER = r'^\d{1,3}(?:[.,]\d{3})+$'
+_DECIMAL_NUMBER = r'^\d+(?:\.\d+)?$'
+
+
+def _parse_market_value_strings(texts):
+    """
+    Euros for each string of an array, NaN where it cannot be parsed
+    (non-strings included): one regex extract over the whole array, then
+    vectorized separator and unit handling
+    """
+    texts = np.asarray(texts, dtype=object)
+    if pd.api.types.infer_dtype(texts, skipna=True) != 'string':
+        texts = np.where([isinstance(text, str) for text in texts], texts, None)
+    parts = pc.extract_regex(pa.array(texts, type=pa.string()), _VALUE_PATTERN)
+    number, unit = parts.field('number'), pc.utf8_lower(parts.field('unit'))
+
+    # '1.234.567' or '500,000' without a unit: thousands separators;
+    # otherwise a comma is a decimal mark
+    grouped = pc.and_(pc.equal(unit, ''), pc.match_substring_regex(number, _GROUPED_NUMBER))
+    number = pc.if_else(grouped, pc.replace_substring_regex(number, r'[.,]', ''),
+                        pc.replace_substring(number, ',', '.'))
+    # Several decimal marks, e.g. '1.2.3m', are not a number
+    number = pc.if_else(pc.match_substring_regex(number, _DECIMAL_NUMBER), number, None)
+    amount = pc.cast(number, pa.float64())
+
+    multipliers = pa.array(list(VALUE_UNITS.values()), type=pa.float64())
+    multiplier = pc.fill_null(pc.take(multipliers, pc.index_in(unit, value_set=pa.array(list(VALUE_UNITS)))), 1.0)
+    return pc.multiply(amount, multiplier).to_numpy(zero_copy_only=False)
+
+
+def parse_market_values(values):
+    """
+    Vectorized market value parser for a Series, array or list of strings
+    such as '€1.50m', '€1,5m', '€900k', '€250Th.', '€1.20bn' or '-'.
+    The distinct strings are parsed once, with Arrow compute kernels over
+    the whole array, and results are gathered back by position: squad
+    columns repeat the same few values a lot.
+    Returns: (float64 array of values in euros, 0 where invalid;
+              boolean array, True where the value was parsed)
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    if pd.api.types.is_numeric_dtype(series):
+        parsed = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        codes, uniques = pd.factorize(series)
+        lookup = np.append(_parse_market_value_strings(uniques), np.nan)
+        parsed = lookup[codes]  # Missing values have code -1, the trailing NaN
+    valid = ~np.isnan(parsed)
+    return np.where(valid, parsed, 0.0), valid
 
 
 def clean_value(value_str):
-    """Clean and convert market value string to numeric"""
-    if not value_str or value_str == '-':
-        return 0
-    
-    # Remove currency symbol and spaces
-    value_str = value_str.replace('€', '').replace('£', '').replace('$', '').strip()
-    
-    # Convert millions/thousands
-    multiplier = 1
-    if 'm' in value_str.lower():
-        multiplier = 1000000
-        value_str = value_str.lower().replace('m', '')
-    elif 'k' in value_str.lower():
-        multiplier = 1000
-        value_str = value_str.lower().replace('k', '')
-    
-    try:
-        return float(value_str) * multiplier
-    except:
-        return 0
+    """Clean and convert one market value string to numeric (0 if unparseable)"""
+    return float(parse_market_values([value_str])[0][0])
+
+
+# ============ PAGE PARSERS ============
+
+# Transfermarkt statistics header titles -> player_stats columns
+STATS_COLUMNS = {
+    'appearances': 'games_played',
+    'minutes played': 'minutes_played',
+    'goals': 'goals',
+    'assists': 'assists',
+    'yellow cards': 'yellow_cards',
+    'red cards': 'red_cards',
+}
+
 
+def _position_group(label):
+    """Map a detailed Transfermarkt position (e.g. 'Centre-Back') to its line"""
+    label = label.lower()
+    if 'goalkeeper' in label:
+        return 'Goalkeeper'
+    if 'back' in label or 'defen' in label or 'sweeper' in label:
+        return 'Defender'
+    if 'midfield' in label:
+        return 'Midfielder'
+    return 'Forward'
+
+
+def _to_int(text):
+    """Integer from a table cell such as '12', "1.234'" or '-'"""
+    digits = re.sub(r'\D', '', text or '')
+    return int(digits) if digits else 0
+
+
+def _class_xpath(name):
+    """XPath predicate matching one class among an element's classes"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Top-level rows of the Transfermarkt 'items' table (inline tables excluded)
+ITEM_ROWS_XPATH = f"//table[{_class_xpath('items')}]/tbody/tr"
+
+
+def _item_rows(html):
+    """lxml rows of the 'items' table, skipping the rest of the page structure"""
+    return lxml_html.fromstring(html).xpath(ITEM_ROWS_XPATH)
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_string_xpath(xpath):
+    """Compiled string() XPath, reused for every row and page"""
+    return etree.XPath(f"string({xpath})")
+
+
+def _row_strings(rows, xpath):
+    """String value of a relative XPath for every row ('' when absent)"""
+    find = _compiled_string_xpath(xpath)
+    return [find(row).strip() for row in rows]
+
+
+def parse_squad_page(html, team_name):
+    """
+    Parse a Transfermarkt squad page straight from its 'items' table
+    Returns: dict of columns (squad schema)
+    """
+    rows = [row for row in _item_rows(html)
+            if row.xpath(f"boolean(.//td[{_class_xpath('hauptlink')}]/a)")]
+    ages = [re.search(r'\((\d+)\)', text) for text in _row_strings(rows, '.')]
+    return {
+        'player_name': _row_strings(rows, f"(.//td[{_class_xpath('hauptlink')}]/a)[1]"),
+        'number': np.array([_to_int(n) for n in _row_strings(rows, f".//div[{_class_xpath('rn_nummer')}]")],
+                           dtype=np.int64),
+        'position': [_position_group(p) for p in
+                     _row_strings(rows, f".//table[{_class_xpath('inline-table')}]//tr[2]/td")],
+        'age': np.array([int(a.group(1)) if a else np.nan for a in ages], dtype=np.float64),
+        'club': [c or None for c in _row_strings(rows, f"(td[{_class_xpath('zentriert')}]/a/img/@alt)[1]")],
+        'market_value': parse_market_values(
+            _row_strings(rows, f"td[{_class_xpath('rechts')} and {_class_xpath('hauptlink')}]"))[0],
+        'nationality': [team_name] * len(rows)
+    }
 
+
+def parse_player_stats_page(html):
+    """
+    Parse a page of Transfermarkt tournament statistics straight from its 'items' table
+    Returns: dict of columns (player_stats schema)
+    """
+    tree = lxml_html.fromstring(html)
+    headers = [th.xpath("string((@title | .//@title)[1])").strip().lower() or th.text_content().strip().lower()
+               for th in tree.xpath(f"//table[{_class_xpath('items')}]/thead/tr/th")]
+    rows = [row for row in tree.xpath(ITEM_ROWS_XPATH)
+            if row.xpath(f"boolean(.//td[{_class_xpath('hauptlink')}]/a)")]
+
+    stats = {
+        'player_name': _row_strings(rows, f"(.//td[{_class_xpath('hauptlink')}]/a)[1]"),
+        'team': [t or None for t in _row_strings(rows, f"(.//img[{_class_xpath('flaggenrahmen')}]/@title)[1]")],
+        'position': [_position_group(p) for p in
+                     _row_strings(rows, f".//table[{_class_xpath('inline-table')}]//tr[2]/td")],
+    }
+    for column in STATS_COLUMNS.values():
+        stats[column] = np.zeros(len(rows), dtype=np.int64)
+    for i, header in enumerate(headers):
+        if header in STATS_COLUMNS:
+            stats[STATS_COLUMNS[header]] = np.array(
+                [_to_int(text) for text in _row_strings(rows, f"td[{i + 1}]")], dtype=np.int64)
+    return stats
+
+
+def parse_matches_page(html):
+    """
+    Parse the Transfermarkt fixtures page
+    Returns: list of match records (matches schema)
+    """
+    # Only the fixture boxes are built into a tree
+    soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('div', class_='box'))
+    matches = []
+    for box in soup.select('div.box'):
+        headline = box.select_one('.content-box-headline')
+        if headline is None:
+            continue
+        title = headline.get_text(strip=True)
+        phase, group = ('Group Stage', title) if title.startswith('Group') else (title, None)
+        date = None
+        for row in box.select('tbody > tr'):
+            teams = row.select('td.hauptlink a[title]')
+            if len(teams) < 2:
+                continue
+            # Transfermarkt only prints the date on the first match of a day
+            parsed = pd.to_datetime(row.find('td').get_text(strip=True), errors='coerce')
+            if not pd.isna(parsed):
+                date = parsed.strftime('%Y-%m-%d')
+            result = row.select_one('a.ergebnis-link')
+            score = re.match(r'(\d+):(\d+)', result.get_text(strip=True)) if result else None
+            matches.append({
+                'match_id': len(matches) + 1,
+                'phase': phase,
+                'group': group,
+                'date': date,
+                'team_home': teams[0]['title'],
+                'team_away': teams[-1]['title'],
+                'score_home': int(score.group(1)) if score else None,
+                'score_away': int(score.group(2)) if score else None,
+                'status': 'Finished' if score else 'Scheduled'
+            })
+    return matches
+
+
+@memo.memoize(lambda: _cache_stamp('teams'))
 def get_participating_teams():
     """
     Scrape all participating teams and their groups - AFCON 2025 MOROCCO
     Returns: DataFrame with columns [team_name, group, team_url, squad_value]
     """
-    cache_file = 'teams.json'
-    cached = get_cached_data(cache_file)
-    if cached:
-        return pd.DataFrame(cached)
-    
+    return _load_dataset('teams', _build_participating_teams, AFCON_URL)
+
+
+def _build_participating_teams():
+    """Build the teams dataset"""
     print("Loading AFCON 2025 Morocco teams...")
     
     # AFCON 2025 Morocco - Real groups and teams
@@ -137,9 +827,7 @@ def get_participating_teams():
                 'squad_value': clean_value(team['value'])
             })
     
-    df = pd.DataFrame(teams_list)
-    save_to_cache(df.to_dict('records'), cache_file)
-    return df
+    return pd.DataFrame(teams_list)
 
 
 # Database of realistic African player names by nationality
@@ -237,10 +925,17 @@ AFRICAN_PLAYER_NAMES = {
 }
 
 
-def get_real_player_names(team_name, count=23):
-    """Get realistic player names for a team"""
-    import random
-    
+def stable_seed(*parts):
+    """
+    Process-independent 64-bit seed derived from DATASET_VERSION and `parts`
+    (BLAKE2b digest, unlike hash() which is salted per process)
+    """
+    key = '|'.join(str(part) for part in (DATASET_VERSION,) + parts)
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def get_real_player_names(team_name, count=23, rng=random):
+    """Get realistic player names for a team, drawn from `rng` (a random.Random)"""
     # Get team-specific names or use default
     if team_name in AFRICAN_PLAYER_NAMES:
         available_names = AFRICAN_PLAYER_NAMES[team_name].copy()
@@ -249,28 +944,84 @@ def get_real_player_names(team_name, count=23):
     
     # If we need more names than available, generate variations
     while len(available_names) < count:
-        base_name = random.choice(available_names[:10])
+        base_name = rng.choice(available_names[:10])
         if ' ' in base_name:
             first, last = base_name.split(' ', 1)
-            available_names.append(f"{first} {random.choice(['Jr.', 'II', 'Mohamed', 'Ahmed'])}")
+            available_names.append(f"{first} {rng.choice(['Jr.', 'II', 'Mohamed', 'Ahmed'])}")
         else:
-            available_names.append(f"{base_name} {random.randint(1, 99)}")
+            available_names.append(f"{base_name} {rng.randint(1, 99)}")
     
     # Shuffle and return the needed count
-    random.shuffle(available_names)
+    rng.shuffle(available_names)
     return available_names[:count]
 
 
+@memo.memoize(lambda: _cache_stamp('players'))
+def get_all_players():
+    """
+    Get the squads of all participating teams as one table
+    Returns: DataFrame with player details, rows grouped by team (nationality)
+    """
+    return _load_dataset('players', _build_all_players, AFCON_URL)
+
+
+def squad_cache_name(team_name):
+    """Cache name of a single team's squad (crawl output and legacy layout)"""
+    return 'squad_' + team_name.replace(' ', '_').replace("'", "")
+
+
+def _build_all_players():
+    """Build the players dataset from every team squad"""
+    teams = get_participating_teams()
+    if LIVE_SCRAPE:
+        import crawler
+        crawler.crawl_squads(teams)
+
+    manifest = _load_manifest()
+    squads = []
+    for team_name in teams['team_name']:
+        # Squads crawled per team under the current dataset version; older
+        # one-file-per-team caches were seeded per process and are regenerated
+        name = squad_cache_name(team_name)
+        current = manifest.get(name, {}).get('dataset_version') == DATASET_VERSION
+        cached = get_cached_data(name) if current else None
+        squads.append(cached if cached is not None else _build_team_squad(team_name))
+    return pd.concat(squads, ignore_index=True)
+
+
+def _team_slices(players):
+    """Index contiguous team blocks of the players table: {team: slice}"""
+    teams = players['nationality'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, teams[1:] != teams[:-1]])
+    stops = np.r_[starts[1:], len(teams)]
+    return {teams[start]: slice(start, stop) for start, stop in zip(starts, stops)}
+
+
+@memo.memoize(lambda: _cache_stamp('players'))
+def get_players_table():
+    """
+    Players table and its team index, built once per version of the cache file
+    Returns: (DataFrame, dict team -> row slice)
+    """
+    players = get_all_players()
+    return players, _team_slices(players)
+
+
+@memo.memoize(lambda: _cache_stamp('players'))
 def get_team_squad(team_name):
     """
     Get complete squad for a team with REALISTIC AFRICAN NAMES
-    Returns: DataFrame with player details
+    Returns: DataFrame with player details (a slice of the players table)
     """
-    cache_file = f'squad_{team_name.replace(" ", "_").replace("'", "")}.json'
-    cached = get_cached_data(cache_file)
-    if cached:
-        return pd.DataFrame(cached)
-    
+    players, index = get_players_table()
+    if team_name not in index:
+        # Not a participating team (e.g. 'TBD'): generate without caching
+        return schema.apply('players', _build_team_squad(team_name))
+    return players.iloc[index[team_name]].reset_index(drop=True)
+
+
+def _build_team_squad(team_name):
+    """Build the squad dataset of one team"""
     print(f"Generating squad for {team_name}...")
     
     # Position distribution (realistic for football)
@@ -287,11 +1038,10 @@ def get_team_squad(team_name):
         'Saudi Pro League', 'MLS', 'Süper Lig', 'Eredivisie', 'Portuguese League'
     ]
     
-    import random
-    random.seed(hash(team_name))
+    rng = random.Random(stable_seed('squad', team_name))
     
     # Get realistic names
-    player_names = get_real_player_names(team_name, 23)
+    player_names = get_real_player_names(team_name, 23, rng)
     
     squad = []
     player_idx = 0
@@ -304,101 +1054,189 @@ def get_team_squad(team_name):
                     'player_name': player_names[player_idx],
                     'number': number,
                     'position': position,
-                    'age': random.randint(19, 35),
-                    'club': random.choice(clubs),
-                    'market_value': random.randint(500000, 80000000) if position != 'Goalkeeper' else random.randint(300000, 40000000),
+                    'age': rng.randint(19, 35),
+                    'club': rng.choice(clubs),
+                    'market_value': rng.randint(500000, 80000000) if position != 'Goalkeeper' else rng.randint(300000, 40000000),
                     'nationality': team_name
                 })
                 player_idx += 1
                 number += 1
     
-    df = pd.DataFrame(squad)
-    save_to_cache(df.to_dict('records'), cache_file)
-    return df
+    return pd.DataFrame(squad)
 
 
+@memo.memoize(lambda: _cache_stamp('player_stats'))
 def get_player_statistics():
     """
     Get tournament statistics for all players
     Returns: DataFrame with goals, assists, minutes, cards
     """
-    cache_file = 'player_stats.json'
-    cached = get_cached_data(cache_file)
-    if cached:
-        return pd.DataFrame(cached)
-    
+    return _load_dataset('player_stats', _build_player_statistics, STATS_URL)
+
+
+def _build_player_statistics():
+    """Build the player statistics dataset"""
+    if LIVE_SCRAPE:
+        import crawler
+        stats, _ = crawler.crawl_player_statistics()
+        if len(stats):
+            return stats
+
     print("Generating player statistics...")
-    
-    teams = get_participating_teams()
-    all_stats = []
-    
-    import random
-    for _, team in teams.iterrows():
-        squad = get_team_squad(team['team_name'])
-        for _, player in squad.iterrows():
-            # Generate realistic stats
-            games_played = random.randint(0, 7)
-            minutes = games_played * random.randint(30, 90)
-            goals = 0
-            assists = 0
-            yellow_cards = 0
-            red_cards = 0
-            
-            if games_played > 0:
-                if player['position'] == 'Forward':
-                    goals = random.randint(0, min(games_played, 5))
-                    assists = random.randint(0, min(games_played, 3))
-                elif player['position'] == 'Midfielder':
-                    goals = random.randint(0, min(games_played, 3))
-                    assists = random.randint(0, min(games_played, 4))
-                elif player['position'] == 'Defender':
-                    goals = random.randint(0, min(games_played, 2))
-                    assists = random.randint(0, min(games_played, 2))
-                
-                yellow_cards = random.randint(0, min(games_played, 3))
-                if yellow_cards > 2:
-                    red_cards = random.randint(0, 1)
-            
-            all_stats.append({
-                'player_name': player['player_name'],
-                'team': team['team_name'],
-                'position': player['position'],
-                'games_played': games_played,
-                'minutes_played': minutes,
-                'goals': goals,
-                'assists': assists,
-                'yellow_cards': yellow_cards,
-                'red_cards': red_cards
-            })
-    
-    df = pd.DataFrame(all_stats)
-    save_to_cache(df.to_dict('records'), cache_file)
-    return df
+    stats = generate_player_statistics(get_all_players(), np.random.default_rng(stable_seed('player_stats')))
+    return carry_over_player_stats(stats, _recorded_dataset('player_stats'))
+
+
+# Player statistics that live ingestion increments
+PLAYER_STAT_COLUMNS = ['games_played', 'minutes_played', 'goals', 'assists', 'yellow_cards', 'red_cards']
 
 
+def carry_over_player_stats(stats, recorded):
+    """
+    Keep the cached statistics of every player of a regenerated table: the
+    cache holds the goals and cards ingested live (live.py), which a
+    generated table would reset. Players new to the table keep their
+    generated values.
+    Returns: DataFrame like `stats`
+    """
+    if recorded is None or recorded.empty:
+        return stats
+    recorded = recorded.drop_duplicates(['team', 'player_name']).set_index(['team', 'player_name'])
+    keys = pd.MultiIndex.from_arrays([stats['team'].astype(str), stats['player_name'].astype(str)])
+    recorded.index = pd.MultiIndex.from_arrays([recorded.index.get_level_values(0).astype(str),
+                                                recorded.index.get_level_values(1).astype(str)])
+    previous = recorded.reindex(keys)
+    found = previous[PLAYER_STAT_COLUMNS[0]].notna().to_numpy()
+    if not found.any():
+        return stats
+    stats = stats.copy()
+    for column in PLAYER_STAT_COLUMNS:
+        values = stats[column].to_numpy(dtype=np.int64, copy=True)
+        values[found] = previous[column].to_numpy()[found]
+        stats[column] = values
+    return stats
+
+
+# Per-position caps on tournament goals and assists: (goals, assists)
+STAT_CAPS = {
+    'Forward': (5, 3),
+    'Midfielder': (3, 4),
+    'Defender': (2, 2),
+    'Goalkeeper': (0, 0),
+}
+MAX_GAMES = 7
+MAX_YELLOW_CARDS = 3
+
+
+def generate_player_statistics(players, rng):
+    """
+    Generate realistic tournament statistics for a players table in a few
+    array operations (vectorized over all players)
+    players: DataFrame with player_name, nationality and position columns
+    rng: numpy.random.Generator
+    Returns: DataFrame with goals, assists, minutes, cards
+    """
+    n = len(players)
+    positions = players['position'].to_numpy()
+    goal_caps = np.zeros(n, dtype=np.int64)
+    assist_caps = np.zeros(n, dtype=np.int64)
+    for position, (goal_cap, assist_cap) in STAT_CAPS.items():
+        mask = positions == position
+        goal_caps[mask] = goal_cap
+        assist_caps[mask] = assist_cap
+
+    games_played = rng.integers(0, MAX_GAMES, size=n, endpoint=True)
+    minutes = games_played * rng.integers(30, 90, size=n, endpoint=True)
+    # Caps never exceed games played, so players without a game get zeros
+    goals = rng.integers(0, np.minimum(games_played, goal_caps), endpoint=True)
+    assists = rng.integers(0, np.minimum(games_played, assist_caps), endpoint=True)
+    yellow_cards = rng.integers(0, np.minimum(games_played, MAX_YELLOW_CARDS), endpoint=True)
+    red_cards = np.where(yellow_cards > 2, rng.integers(0, 1, size=n, endpoint=True), 0)
+
+    return pd.DataFrame({
+        'player_name': players['player_name'].to_numpy(),
+        'team': players['nationality'].to_numpy(),
+        'position': positions,
+        'games_played': games_played,
+        'minutes_played': minutes,
+        'goals': goals,
+        'assists': assists,
+        'yellow_cards': yellow_cards,
+        'red_cards': red_cards
+    })
+
+
+@memo.memoize(lambda: _cache_stamp('matches'))
 def get_matches_and_results():
     """
     Get all matches with results - AFCON 2025 MOROCCO CALENDAR
     Returns: DataFrame with match information
     """
-    cache_file = 'matches.json'
-    cached = get_cached_data(cache_file)
-    if cached:
-        return pd.DataFrame(cached)
-    
+    return _load_dataset('matches', _build_matches_and_results, FIXTURES_URL)
+
+
+def _build_matches_and_results():
+    """Build the match calendar dataset, keeping the results already recorded in the cache"""
+    return carry_over_results(_build_match_calendar(), _recorded_dataset('matches'))
+
+
+def _recorded_dataset(name):
+    """
+    Cached dataset whose recorded results a rebuild must keep: None if it
+    was never cached or was built by another DATASET_VERSION
+    """
+    entry = _load_manifest().get(name)
+    if entry is None or entry.get('dataset_version') != DATASET_VERSION:
+        return None
+    return get_cached_data(name)
+
+
+def carry_over_results(matches, recorded):
+    """
+    Copy the scores and status of `recorded` matches into a rebuilt
+    calendar, by match_id. A rebuilt match keeps its own result if it has
+    one (a crawled score), and only takes a recorded one if both list the
+    same teams.
+    Returns: DataFrame like `matches`
+    """
+    if recorded is None or recorded.empty:
+        return matches
+    recorded = standings.played_matches(recorded)
+    recorded = recorded[~recorded['match_id'].duplicated()].set_index('match_id')
+    previous = recorded.reindex(matches['match_id'].to_numpy())
+    take = (
+        matches['score_home'].isna().to_numpy()
+        & previous['score_home'].notna().to_numpy()
+        & (previous['team_home'].astype(str).to_numpy() == matches['team_home'].astype(str).to_numpy())
+        & (previous['team_away'].astype(str).to_numpy() == matches['team_away'].astype(str).to_numpy())
+    )
+    if not take.any():
+        return matches
+    matches = matches.copy()
+    for column in ('score_home', 'score_away', 'status'):
+        matches[column] = matches[column].astype(object)
+        matches.loc[take, column] = previous[column].to_numpy(dtype=object)[take]
+    return matches
+
+
+def _build_match_calendar():
+    """Build the match calendar: crawled fixtures, or the generated AFCON 2025 calendar"""
+    if LIVE_SCRAPE:
+        import crawler
+        matches, _ = crawler.crawl_matches()
+        if matches:
+            return pd.DataFrame(matches)
+
     print("Generating AFCON 2025 Morocco match calendar...")
     
     teams = get_participating_teams()
     matches = []
     match_id = 1
     
-    import random
-    random.seed(42)
-    
     # AFCON 2025 Morocco: December 21, 2025 - January 18, 2026
     # MATCHES À VENIR - La compétition n'a pas encore commencé!
     # Group stage matches - 3 matchdays
-    groups = teams.groupby('group')
+    groups = teams.groupby('group', observed=True)
     matchday_dates = {
         1: ['2025-12-21', '2025-12-22', '2025-12-23'],  # Matchday 1
         2: ['2025-12-25', '2025-12-26', '2025-12-27'],  # Matchday 2
@@ -456,9 +1294,156 @@ def get_matches_and_results():
             })
             match_id += 1
     
-    df = pd.DataFrame(matches)
-    save_to_cache(df.to_dict('records'), cache_file)
-    return df
+    return pd.DataFrame(matches)
+
+
+# Columns of the matches index: a team is keyed by both of its sides
+MATCH_INDEX_KEYS = {
+    'team': ('team_home', 'team_away'),
+    'group': ('group',),
+    'phase': ('phase',),
+    'date': ('date',),
+}
+
+
+def build_matches_index(matches):
+    """
+    Inverted index of the matches frame: for each key kind of
+    MATCH_INDEX_KEYS, value -> row positions in date order. Matches
+    without a date come last and, like those without a group, are left
+    out of their key.
+    Returns: dict kind -> dict value -> int array
+    """
+    # NaT sorts last; None or NaN in the raw object column cannot be compared
+    dates = pd.to_datetime(matches['date'], errors='coerce').to_numpy()
+    order = np.argsort(dates, kind='stable')
+    index = {}
+    for kind, columns in MATCH_INDEX_KEYS.items():
+        # One (key, row) pair per column, rows kept in date order
+        keys = np.column_stack([matches[column].to_numpy(dtype=object) for column in columns])[order]
+        for column in range(1, len(columns)):  # A row is listed once per value ('TBD' vs 'TBD')
+            keys[(keys[:, [column]] == keys[:, :column]).any(axis=1), column] = None
+        keys = keys.ravel()
+        rows = np.repeat(order, len(columns))
+        codes, values = pd.factorize(keys)  # Missing keys (e.g. no group) get -1
+        by_code = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(values))
+        positions = np.split(rows[by_code][np.count_nonzero(codes < 0):], np.cumsum(counts)[:-1])
+        index[kind] = dict(zip(values, positions))
+    return index
+
+
+@memo.memoize(lambda: _cache_stamp('matches'))
+def get_matches_table():
+    """
+    Matches table and its inverted index, built once per version of the cache file
+    Returns: (DataFrame, dict kind -> dict value -> row positions)
+    """
+    matches = get_matches_and_results()
+    return matches, build_matches_index(matches)
+
+
+def select_matches(matches, index, kind, value):
+    """Rows of `matches` whose `kind` ('team', 'group', 'phase', 'date') is `value`, in date order"""
+    return matches.iloc[index[kind].get(value, np.empty(0, dtype=np.int64))]
+
+
+LINEUP_SIZE = 11
+
+
+def _hash_uniform(seeds, streams, slots):
+    """
+    Deterministic uniforms in [0, 1) from SplitMix64 mixing of (seed, stream,
+    slot), broadcast elementwise: a match gets the same draws whatever batch
+    it is requested in
+    """
+    with np.errstate(over='ignore'):
+        z = np.asarray(seeds, dtype=np.uint64) ^ (np.asarray(streams, dtype=np.uint64) << np.uint64(32))
+        z = z + np.asarray(slots, dtype=np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+@memo.memoize(lambda: _cache_stamp('matches', 'players'))
+def _match_details_batch(match_ids):
+    """Columnar goal events and lineups for a tuple of match ids (None for all)"""
+    matches = get_matches_and_results()
+    if match_ids is not None:
+        matches = matches[matches['match_id'].isin(match_ids)]
+    players, index = get_players_table()
+    return build_match_details(matches, players, index)
+
+
+def build_match_details(matches, players, team_index=None):
+    """
+    Lineups and goal events of `matches`, drawn from the squads of `players`.
+    Each match is drawn from its own seed, so the result for a match does
+    not depend on the other matches passed along.
+    team_index: _team_slices(players), if already built
+    Returns: (events DataFrame, lineups DataFrame), see get_match_details_batch
+    """
+    index = team_index if team_index is not None else _team_slices(players)
+
+    # One row per (match, side) whose team is known: 'TBD' sides have no lineup
+    sides = pd.concat([
+        pd.DataFrame({'match_id': matches['match_id'].to_numpy(), 'side': side,
+                      'team': matches[f'team_{side}'].to_numpy(),
+                      'goals': matches[f'score_{side}'].to_numpy()})
+        for side in ('home', 'away')
+    ], ignore_index=True)
+    sides = sides[sides['team'].isin(list(index))].reset_index(drop=True)
+    starts = np.array([index[team].start for team in sides['team']], dtype=np.int64)
+    sizes = np.array([index[team].stop - index[team].start for team in sides['team']], dtype=np.int64)
+    seeds = np.array([stable_seed('match_details', match_id) for match_id in sides['match_id']],
+                     dtype=np.uint64)
+    side_codes = (sides['side'] == 'away').to_numpy(dtype=np.int64)
+
+    # Lineups: the squad players with the LINEUP_SIZE smallest random keys
+    slots = np.arange(sizes.max() if len(sizes) else 0)
+    keys = _hash_uniform(seeds[:, None], side_codes[:, None], slots[None, :])
+    keys[slots[None, :] >= sizes[:, None]] = np.inf
+    lineup_sizes = np.minimum(sizes, LINEUP_SIZE)
+    picks = np.argsort(keys, axis=1)[:, :LINEUP_SIZE]
+    rows = (starts[:, None] + picks)[np.arange(picks.shape[1])[None, :] < lineup_sizes[:, None]]
+    lineup_side = np.repeat(np.arange(len(sides)), lineup_sizes)
+    lineups = pd.DataFrame({
+        'match_id': sides['match_id'].to_numpy()[lineup_side],
+        'side': sides['side'].to_numpy()[lineup_side],
+        'team': sides['team'].to_numpy()[lineup_side],
+        'player_name': players['player_name'].to_numpy()[rows],
+        'position': players['position'].to_numpy()[rows],
+        'number': players['number'].to_numpy()[rows],
+    })
+
+    # Goals of played matches, each scored by a player of that side's lineup
+    goals = pd.to_numeric(sides['goals'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+    goal_side = np.repeat(np.arange(len(sides)), goals)
+    goal_slot = np.arange(len(goal_side)) - np.repeat(np.cumsum(goals) - goals, goals)
+    goal_seeds, goal_codes = seeds[goal_side], side_codes[goal_side]
+    scorer = (_hash_uniform(goal_seeds, 2 + goal_codes, goal_slot) * lineup_sizes[goal_side]).astype(np.int64)
+    minute = 1 + (_hash_uniform(goal_seeds, 4 + goal_codes, goal_slot) * 90).astype(np.int64)
+    lineup_offsets = np.cumsum(lineup_sizes) - lineup_sizes
+    events = pd.DataFrame({
+        'match_id': sides['match_id'].to_numpy()[goal_side],
+        'event': 'goal',
+        'minute': minute,
+        'side': sides['side'].to_numpy()[goal_side],
+        'team': sides['team'].to_numpy()[goal_side],
+        'player_name': players['player_name'].to_numpy()[rows[lineup_offsets[goal_side] + scorer]],
+    }).sort_values(['match_id', 'minute'], kind='stable').reset_index(drop=True)
+    return events, lineups
+
+
+def get_match_details_batch(match_ids=None):
+    """
+    Get lineups and goal events of many matches (all if None) in one pass.
+    Scheduled matches get lineups but no events; 'TBD' sides get neither.
+    Returns: (events DataFrame [match_id, event, minute, side, team, player_name],
+              lineups DataFrame [match_id, side, team, player_name, position, number])
+    """
+    return _match_details_batch(None if match_ids is None else tuple(sorted(set(int(m) for m in match_ids))))
 
 
 def get_match_details(match_id):
@@ -466,114 +1451,133 @@ def get_match_details(match_id):
     Get detailed information for a specific match
     Returns: dict with lineups, scorers, events
     """
-    import random
-    random.seed(match_id)
-    
     matches = get_matches_and_results()
-    match = matches[matches['match_id'] == match_id].iloc[0]
-    
-    # Generate lineups
-    home_squad = get_team_squad(match['team_home'])
-    away_squad = get_team_squad(match['team_away'])
-    
-    home_lineup = home_squad.sample(n=11)['player_name'].tolist()
-    away_lineup = away_squad.sample(n=11)['player_name'].tolist()
-    
-    # Generate scorers
-    scorers = []
-    for _ in range(match['score_home']):
-        scorers.append({
-            'team': match['team_home'],
-            'player': random.choice(home_lineup),
-            'minute': random.randint(1, 90)
-        })
-    for _ in range(match['score_away']):
-        scorers.append({
-            'team': match['team_away'],
-            'player': random.choice(away_lineup),
-            'minute': random.randint(1, 90)
-        })
-    
-    scorers.sort(key=lambda x: x['minute'])
+    match = matches[matches['match_id'] == match_id]
+    if match.empty:
+        raise KeyError(f"Unknown match_id {match_id}")
+    events, lineups = get_match_details_batch([match_id])
     
     return {
-        'match_info': match.to_dict(),
-        'home_lineup': home_lineup,
-        'away_lineup': away_lineup,
-        'scorers': scorers
+        'match_info': match.iloc[0].to_dict(),
+        'home_lineup': lineups.loc[lineups['side'] == 'home', 'player_name'].tolist(),
+        'away_lineup': lineups.loc[lineups['side'] == 'away', 'player_name'].tolist(),
+        'scorers': events.rename(columns={'player_name': 'player'})[['team', 'player', 'minute']].to_dict('records')
     }
 
 
+@memo.memoize(lambda: _cache_stamp('team_stats'))
 def aggregate_team_stats():
     """
-    Aggregate statistics by team - AVANT LE TOURNOI
+    Aggregate statistics by team, standings derived from played matches
     Returns: DataFrame with team-level statistics
     """
-    cache_file = 'team_stats.json'
-    cached = get_cached_data(cache_file)
-    if cached:
-        return pd.DataFrame(cached)
-    
-    print("Generating team information (tournament not started yet)...")
+    return _load_dataset('team_stats', _build_team_stats)
+
+
+def _build_team_stats():
+    """Build the team statistics dataset"""
+    print("Computing team statistics from match results...")
     
     teams = get_participating_teams()
+    players = get_all_players()
+    squads = players.groupby('nationality', observed=True)['age'].agg(['mean', 'size'])
     
-    team_stats = []
-    for _, team in teams.iterrows():
-        team_name = team['team_name']
-        squad = get_team_squad(team_name)
-        
-        # Tournament hasn't started yet - all stats are 0
-        team_stats.append({
-            'team_name': team_name,
-            'group': team['group'],
-            'squad_value': team['squad_value'],
-            'matches_played': 0,  # Pas encore joué
-            'wins': 0,
-            'draws': 0,
-            'losses': 0,
-            'goals_scored': 0,
-            'goals_conceded': 0,
-            'goal_difference': 0,
-            'points': 0,  # Pas encore de points
-            'avg_age': squad['age'].mean(),
-            'total_players': len(squad)
-        })
-    
-    df = pd.DataFrame(team_stats)
-    save_to_cache(df.to_dict('records'), cache_file)
-    return df
+    matches = standings.group_stage_matches(get_matches_and_results())
+    table = standings.compute_standings(matches, teams['team_name'])
+    table.insert(1, 'group', teams['group'].to_numpy())
+    table.insert(2, 'squad_value', teams['squad_value'].to_numpy())
+    table['avg_age'] = table['team_name'].map(squads['mean'])
+    table['total_players'] = table['team_name'].map(squads['size']).fillna(0).astype(np.int64)
+    return table
+
+
+def record_match_result(match_id, score_home, score_away):
+    """
+    Record the final score of a match. Only the two affected rows of the
+    team statistics are updated (a previously recorded score is reverted
+    first) instead of recomputing the whole table; knockout results leave
+    the group standings untouched.
+    Raises KeyError for an unknown match_id, ValueError for a score that
+    is not a non-negative integer.
+    Returns: updated team statistics DataFrame
+    """
+    for score in (score_home, score_away):
+        if isinstance(score, bool) or not isinstance(score, numbers.Integral) or score < 0:
+            raise ValueError(f"Invalid score {score!r}: expected a non-negative integer")
+    score_home, score_away = int(score_home), int(score_away)
+
+    # Read-modify-write of two datasets: one writer at a time across processes
+    with results_lock():
+        matches = get_matches_and_results().copy()
+        rows = matches.index[matches['match_id'] == match_id]
+        if rows.empty:
+            raise KeyError(f"Unknown match_id {match_id}")
+        row = rows[0]
+        match = matches.loc[row]
+        table = aggregate_team_stats().set_index('team_name')
+
+        if match['phase'] == standings.GROUP_STAGE:
+            if pd.notna(match['score_home']) and pd.notna(match['score_away']):
+                standings.apply_result(table, match['team_home'], match['team_away'],
+                                       int(match['score_home']), int(match['score_away']), sign=-1)
+            standings.apply_result(table, match['team_home'], match['team_away'], score_home, score_away)
+
+        matches['score_home'] = matches['score_home'].astype(object)
+        matches['score_away'] = matches['score_away'].astype(object)
+        matches.loc[row, ['score_home', 'score_away', 'status']] = [score_home, score_away, 'Finished']
+        table = table.reset_index()
+        save_to_cache(matches, 'matches', FIXTURES_URL)
+        save_to_cache(table, 'team_stats')
+    return table
+
+
+@memo.memoize(lambda: _cache_stamp('team_stats', 'matches'))
+def get_standings_index():
+    """
+    Ranked standings of every group, built once per version of the
+    team_stats and matches caches
+    Returns: dict group -> DataFrame
+    """
+    return build_standings_index(aggregate_team_stats(), get_matches_and_results())
 
 
+def build_standings_index(team_stats, matches):
+    """Rank every group of a team statistics table: dict group -> DataFrame"""
+    group_matches = standings.group_stage_matches(matches)
+    return {
+        group: standings.rank_group(group_teams, group_matches)
+        for group, group_teams in team_stats.groupby('group', sort=True, observed=True)
+    }
+
+
+@memo.memoize(lambda: _cache_stamp('team_stats', 'matches'))
 def get_group_standings(group_name):
     """
     Get standings for a specific group
-    Returns: DataFrame sorted by points
+    Returns: DataFrame ranked by points, then CAF tie-breakers
     """
-    team_stats = aggregate_team_stats()
-    group_teams = team_stats[team_stats['group'] == group_name].copy()
-    
-    # Sort by points, then goal difference, then goals scored
-    group_teams = group_teams.sort_values(
-        ['points', 'goal_difference', 'goals_scored'],
-        ascending=[False, False, False]
-    )
-    
-    return group_teams
+    index = get_standings_index()
+    if group_name not in index:
+        return aggregate_team_stats().iloc[0:0]
+    return index[group_name]
 
 
 # Data loading functions for Streamlit
+@memo.memoize(lambda: _cache_stamp('teams', 'players', 'player_stats', 'matches', 'team_stats'))
 def load_all_data():
     """
     Load all data needed for the dashboard
-    Returns: dict with all dataframes
+    Returns: DatasetBundle (read-only mapping of dataframes, with a content-hash version)
     """
-    return {
+    matches, matches_index = get_matches_table()
+    return DatasetBundle({
         'teams': get_participating_teams(),
+        'players': get_all_players(),
         'player_stats': get_player_statistics(),
-        'matches': get_matches_and_results(),
+        'matches': matches,
+        'matches_index': matches_index,
         'team_stats': aggregate_team_stats()
-    }
+    })
 
 
 if __name__ == "__main__":
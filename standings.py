@@ -0,0 +1,119 @@
+"""
+Standings engine for AFCON
+Derives W/D/L/GF/GA/GD/Pts from match results with vectorized group-bys,
+updates them incrementally when a single result arrives, and ranks groups
+with the CAF tie-breakers
+"""
+
+import numpy as np
+import pandas as pd
+
+STANDINGS_COLUMNS = [
+    'matches_played', 'wins', 'draws', 'losses',
+    'goals_scored', 'goals_conceded', 'goal_difference', 'points'
+]
+POINTS_WIN = 3
+POINTS_DRAW = 1
+# Only this phase counts towards the group tables
+GROUP_STAGE = 'Group Stage'
+
+
+def played_matches(matches):
+    """Matches with a final score"""
+    return matches[matches['score_home'].notna() & matches['score_away'].notna()]
+
+
+def group_stage_matches(matches):
+    """Group stage matches: knockout results never count in a group table"""
+    return matches[matches['phase'] == GROUP_STAGE]
+
+
+def _team_results(matches):
+    """One row per team and played match: team_name, goals scored, goals conceded"""
+    played = played_matches(matches)
+    home_goals = played['score_home'].to_numpy(dtype=np.int64)
+    away_goals = played['score_away'].to_numpy(dtype=np.int64)
+    return pd.DataFrame({
+        'team_name': np.concatenate([played['team_home'].to_numpy(), played['team_away'].to_numpy()]),
+        'goals_scored': np.concatenate([home_goals, away_goals]),
+        'goals_conceded': np.concatenate([away_goals, home_goals]),
+    })
+
+
+def compute_standings(matches, team_names):
+    """
+    Standings of `team_names` over every played match
+    Returns: DataFrame with team_name and STANDINGS_COLUMNS, in team_names order
+    """
+    results = _team_results(matches)
+    scored, conceded = results['goals_scored'], results['goals_conceded']
+    results['matches_played'] = 1
+    results['wins'] = (scored > conceded).astype(np.int64)
+    results['draws'] = (scored == conceded).astype(np.int64)
+    results['losses'] = (scored < conceded).astype(np.int64)
+    totals = results.groupby('team_name').sum()
+
+    table = pd.DataFrame({'team_name': list(team_names)})
+    table = table.join(totals, on='team_name')
+    table = table.fillna(0)
+    for column in ('matches_played', 'wins', 'draws', 'losses', 'goals_scored', 'goals_conceded'):
+        table[column] = table[column].astype(np.int64)
+    table['goal_difference'] = table['goals_scored'] - table['goals_conceded']
+    table['points'] = POINTS_WIN * table['wins'] + POINTS_DRAW * table['draws']
+    return table[['team_name'] + STANDINGS_COLUMNS]
+
+
+def apply_result(table, team_home, team_away, score_home, score_away, sign=1):
+    """
+    Apply one result to a standings table indexed by team_name, in place.
+    Only the two rows of the teams involved are touched; sign=-1 removes a
+    result that was applied before (e.g. a corrected score).
+    Teams missing from the table (e.g. 'TBD') are ignored.
+    """
+    for team, scored, conceded in ((team_home, score_home, score_away),
+                                   (team_away, score_away, score_home)):
+        if team not in table.index:
+            continue
+        won, drawn, lost = int(scored > conceded), int(scored == conceded), int(scored < conceded)
+        table.loc[team, STANDINGS_COLUMNS] += sign * np.array([
+            1, won, drawn, lost, scored, conceded, scored - conceded,
+            POINTS_WIN * won + POINTS_DRAW * drawn
+        ])
+    return table
+
+
+def _head_to_head(matches, teams):
+    """Standings of `teams` restricted to the matches they played against each other"""
+    mutual = matches[matches['team_home'].isin(teams) & matches['team_away'].isin(teams)]
+    return compute_standings(mutual, teams).set_index('team_name')
+
+
+def rank_group(group_table, matches):
+    """
+    Sort one group's standings with the CAF tie-breakers: points, then
+    points, goal difference and goals scored in the matches between the
+    tied teams, then overall goal difference and goals scored.
+    Head-to-head is only computed for blocks of teams tied on points.
+    """
+    table = group_table.sort_values(
+        ['points', 'goal_difference', 'goals_scored', 'team_name'],
+        ascending=[False, False, False, True]
+    )
+    tied_points = table['points'][table['points'].duplicated(keep=False)].unique()
+    if len(tied_points) == 0:
+        return table
+
+    blocks = []
+    for points, block in table.groupby('points', sort=False):
+        if points in tied_points:
+            h2h = _head_to_head(matches, block['team_name'].tolist())
+            block = block.assign(
+                _h2h_points=block['team_name'].map(h2h['points']),
+                _h2h_gd=block['team_name'].map(h2h['goal_difference']),
+                _h2h_gf=block['team_name'].map(h2h['goals_scored']),
+            ).sort_values(
+                ['_h2h_points', '_h2h_gd', '_h2h_gf', 'goal_difference', 'goals_scored', 'team_name'],
+                ascending=[False, False, False, False, False, True]
+            ).drop(columns=['_h2h_points', '_h2h_gd', '_h2h_gf'])
+        blocks.append(block)
+    return pd.concat(blocks)
@@ -3,12 +3,17 @@ Visualization module for AFCON dashboard
 Contains all plotting functions using Plotly
 """
 
+import json
+
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 
+import memo
+
 # BEAUTIFUL VIBRANT COLOR SCHEME
 COLOR_PALETTE = {
     'primary': '#00F260',      # Vibrant Green
@@ -30,10 +35,30 @@ COLORS = [
 ]
 
 
-def apply_custom_theme(fig, title=None):
-    """Apply beautiful dark theme to plotly figures with white titles"""
-    fig.update_layout(
-        title=title,
+AFCON_TEMPLATE = 'afcon'
+# Trace types drawn by the builders below; the template keeps the base
+# template's defaults for these only
+_TEMPLATE_TRACE_TYPES = ('bar', 'box', 'heatmap', 'histogram', 'pie', 'scatter', 'scattergl', 'scatterpolar')
+# Base template layout parts no chart here uses (3D, maps, ternary plots)
+_TEMPLATE_UNUSED_LAYOUT = ('geo', 'mapbox', 'map', 'scene', 'ternary')
+
+
+def _register_template():
+    """
+    Register the dark AFCON theme as a named Plotly template, on top of the
+    default template of the process (streamlit's in the app). Figures then
+    reference it by name instead of each rewriting the layout. Streamlit
+    merges its own theme into the template of a chart: show them with
+    st.plotly_chart(..., theme=None).
+    """
+    base = pio.templates[pio.templates.default].to_plotly_json()
+    layout = {k: v for k, v in base.get('layout', {}).items() if k not in _TEMPLATE_UNUSED_LAYOUT}
+    data = {k: v for k, v in base.get('data', {}).items() if k in _TEMPLATE_TRACE_TYPES}
+    template = go.layout.Template(layout=layout, data=data)
+    
+    # Grid styling with vibrant green tint
+    axis = dict(showgrid=True, gridwidth=1, gridcolor='rgba(0, 242, 96, 0.15)', color='white')
+    template.layout.update(
         title_font_size=22,
         title_font_color='white',  # WHITE TITLES
         title_font_family='Poppins, sans-serif',
@@ -48,23 +73,19 @@ def apply_custom_theme(fig, title=None):
             bordercolor='rgba(0, 242, 96, 0.3)',
             borderwidth=1,
             font=dict(color='white')
-        )
-    )
-    
-    # Grid styling with vibrant green tint
-    fig.update_xaxes(
-        showgrid=True, 
-        gridwidth=1, 
-        gridcolor='rgba(0, 242, 96, 0.15)',
-        color='white'
-    )
-    fig.update_yaxes(
-        showgrid=True, 
-        gridwidth=1, 
-        gridcolor='rgba(0, 242, 96, 0.15)',
-        color='white'
+        ),
+        xaxis=axis,
+        yaxis=axis
     )
-    
+    pio.templates[AFCON_TEMPLATE] = template
+
+
+_register_template()
+
+
+def apply_custom_theme(fig, title=None):
+    """Apply beautiful dark theme to plotly figures with white titles"""
+    fig.update_layout(template=AFCON_TEMPLATE, title=title)
     return fig
 
 
@@ -133,7 +154,7 @@ def plot_top_scorers(player_stats_df, top_n=15):
     df = df.nlargest(top_n, 'goals').sort_values('goals', ascending=True)
     
     # Create labels with player name and team
-    df['label'] = df['player_name'] + ' (' + df['team'] + ')'
+    df['label'] = df['player_name'].astype(str) + ' (' + df['team'].astype(str) + ')'
     
     fig = go.Figure()
     
@@ -162,7 +183,7 @@ def plot_top_assists(player_stats_df, top_n=15):
     df = player_stats_df[player_stats_df['assists'] > 0].copy()
     df = df.nlargest(top_n, 'assists').sort_values('assists', ascending=True)
     
-    df['label'] = df['player_name'] + ' (' + df['team'] + ')'
+    df['label'] = df['player_name'].astype(str) + ' (' + df['team'].astype(str) + ')'
     
     fig = go.Figure()
     
@@ -188,24 +209,86 @@ def plot_top_assists(player_stats_df, top_n=15):
 
 # ============ DISTRIBUTION CHARTS ============
 
-def plot_age_distribution(teams_df):
-    """Histogram of player age distribution"""
-    from scraper import get_team_squad
-    
-    all_ages = []
-    for _, team in teams_df.iterrows():
-        squad = get_team_squad(team['team_name'])
-        all_ages.extend(squad['age'].tolist())
-    
+AGE_BINS = 20
+VALUE_BINS = 30
+
+
+def histogram_edges(values, bins, integer=False):
+    """
+    Bin edges of `bins` equal-width bins spanning `values`; with
+    integer=True, widths are whole numbers and each integer sits in the
+    middle of a bin. Computed once on the full data and passed to the
+    histogram builders, they keep bins identical across filtered views.
+    Missing values (NaN) are ignored.
+    Returns: tuple of floats (hashable, so usable in figure cache keys)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return (0.0, 1.0)
+    low, high = values.min(), values.max()
+    if integer:
+        width = max(1, int(np.ceil((high - low + 1) / bins)))
+        edges = np.arange(low - 0.5, high + 0.5 + width, width)
+        edges = edges[:np.searchsorted(edges, high + 0.5, side='left') + 1]
+    else:
+        edges = np.histogram_bin_edges(values, bins=bins)
+    return tuple(float(e) for e in edges)
+
+
+def _integer_bin_labels(edges):
+    """
+    Hover label of each bin from histogram_edges(integer=True): the integer
+    at its centre for a width of 1, else the first and last integers it holds
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    first, last = np.ceil(edges[:-1]).astype(int), np.floor(edges[1:]).astype(int)
+    return [str(lo) if lo == hi else f"{lo}–{hi}" for lo, hi in zip(first, last)]
+
+
+def _binned_trace(values, edges, color, hovertemplate, labels=None):
+    """
+    Bar trace of the counts of `values` in `edges`: one bar per bin
+    instead of one point per value. Each bar carries its bin bounds as
+    customdata for the hover label, or its entry of `labels` if given.
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    counts, _ = np.histogram(values, bins=edges)
+    return go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        customdata=np.column_stack([edges[:-1], edges[1:]]) if labels is None else labels,
+        marker_color=color,
+        opacity=0.7,
+        hovertemplate=hovertemplate
+    )
+
+
+def plot_age_distribution(players_df, bin_edges=None, binned=True):
+    """
+    Histogram of player age distribution
+    binned: count ages per bin here and send only the counts; False sends
+    every age and lets the browser bin them
+    bin_edges: edges from histogram_edges (default: computed on players_df)
+    """
+    ages = players_df['age'].dropna().to_numpy(dtype=np.float64)  # Age not listed on the squad page
     fig = go.Figure()
     
-    fig.add_trace(go.Histogram(
-        x=all_ages,
-        nbinsx=20,
-        marker_color=COLOR_PALETTE['primary'],
-        opacity=0.7,
-        hovertemplate='Âge: %{x}<br>Nombre: %{y}<extra></extra>'
-    ))
+    if binned:
+        edges = tuple(bin_edges) if bin_edges is not None else histogram_edges(ages, AGE_BINS, integer=True)
+        fig.add_trace(_binned_trace(
+            ages, edges, COLOR_PALETTE['primary'],
+            'Âge: %{customdata}<br>Nombre: %{y}<extra></extra>',
+            labels=_integer_bin_labels(edges)
+        ))
+    else:
+        fig.add_trace(go.Histogram(
+            x=ages,
+            nbinsx=AGE_BINS,
+            marker_color=COLOR_PALETTE['primary'],
+            opacity=0.7,
+            hovertemplate='Âge: %{x}<br>Nombre: %{y}<extra></extra>'
+        ))
     
     fig = apply_custom_theme(fig, 'Distribution des Âges des Joueurs')
     fig.update_layout(
@@ -217,27 +300,33 @@ def plot_age_distribution(teams_df):
     return fig
 
 
-def plot_value_distribution(teams_df):
-    """Histogram of player market value distribution"""
-    from scraper import get_team_squad
-    
-    all_values = []
-    for _, team in teams_df.iterrows():
-        squad = get_team_squad(team['team_name'])
-        all_values.extend(squad['market_value'].tolist())
-    
+def plot_value_distribution(players_df, bin_edges=None, binned=True):
+    """
+    Histogram of player market value distribution
+    binned: count values per bin here and send only the counts; False sends
+    every value and lets the browser bin them
+    bin_edges: edges in millions from histogram_edges (default: computed on players_df)
+    """
+    values = players_df['market_value'].dropna().to_numpy(dtype=np.float64)
     # Convert to millions for better readability
-    all_values_m = [v / 1_000_000 for v in all_values if v > 0]
+    all_values_m = values[values > 0] / 1_000_000
     
     fig = go.Figure()
     
-    fig.add_trace(go.Histogram(
-        x=all_values_m,
-        nbinsx=30,
-        marker_color=COLOR_PALETTE['accent'],
-        opacity=0.7,
-        hovertemplate='Valeur: €%{x:.1f}M<br>Nombre: %{y}<extra></extra>'
-    ))
+    if binned:
+        edges = tuple(bin_edges) if bin_edges is not None else histogram_edges(all_values_m, VALUE_BINS)
+        fig.add_trace(_binned_trace(
+            all_values_m, edges, COLOR_PALETTE['accent'],
+            'Valeur: €%{customdata[0]:.1f}M–€%{customdata[1]:.1f}M<br>Nombre: %{y}<extra></extra>'
+        ))
+    else:
+        fig.add_trace(go.Histogram(
+            x=all_values_m,
+            nbinsx=VALUE_BINS,
+            marker_color=COLOR_PALETTE['accent'],
+            opacity=0.7,
+            hovertemplate='Valeur: €%{x:.1f}M<br>Nombre: %{y}<extra></extra>'
+        ))
     
     fig = apply_custom_theme(fig, 'Distribution des Valeurs Marchandes')
     fig.update_layout(
@@ -251,20 +340,14 @@ def plot_value_distribution(teams_df):
 
 # ============ PIE CHARTS ============
 
-def plot_league_distribution(teams_df):
+def plot_league_distribution(players_df):
     """Pie chart of players by league/club"""
-    from scraper import get_team_squad
-    
-    league_counts = {}
-    for _, team in teams_df.iterrows():
-        squad = get_team_squad(team['team_name'])
-        for club in squad['club']:
-            league_counts[club] = league_counts.get(club, 0) + 1
+    league_counts = players_df['club'].value_counts()
+    league_counts = league_counts[league_counts > 0]  # Categories absent from a filtered frame
     
     # Group smaller leagues into "Other"
-    sorted_leagues = sorted(league_counts.items(), key=lambda x: x[1], reverse=True)
-    top_leagues = dict(sorted_leagues[:5])
-    other_count = sum(count for _, count in sorted_leagues[5:])
+    top_leagues = league_counts.iloc[:5].to_dict()
+    other_count = int(league_counts.iloc[5:].sum())
     if other_count > 0:
         top_leagues['Other'] = other_count
     
@@ -286,6 +369,7 @@ def plot_league_distribution(teams_df):
 def plot_position_distribution(player_stats_df):
     """Pie chart of players by position"""
     position_counts = player_stats_df['position'].value_counts()
+    position_counts = position_counts[position_counts > 0]  # Categories absent from a filtered frame
     
     fig = go.Figure()
     
@@ -304,20 +388,13 @@ def plot_position_distribution(player_stats_df):
 
 # ============ BOX PLOTS ============
 
-def plot_value_boxplot(teams_df):
+def plot_value_boxplot(players_df):
     """Box plot of value distribution by team"""
-    from scraper import get_team_squad
-    
-    data = []
-    for _, team in teams_df.iterrows():
-        squad = get_team_squad(team['team_name'])
-        for _, player in squad.iterrows():
-            data.append({
-                'team': team['team_name'],
-                'value': player['market_value'] / 1_000_000
-            })
-    
-    df = pd.DataFrame(data)
+    # Plain strings keep the teams in table order rather than category order
+    df = pd.DataFrame({
+        'team': players_df['nationality'].astype(str).to_numpy(),
+        'value': players_df['market_value'].to_numpy() / 1_000_000
+    })
     
     fig = px.box(
         df,
@@ -341,24 +418,91 @@ def plot_value_boxplot(teams_df):
 
 # ============ SCATTER PLOTS ============
 
-def plot_value_vs_performance(team_stats_df):
-    """Scatter plot of squad value vs goals scored"""
+# Above this many points scatters switch from SVG to WebGL
+SCATTER_WEBGL_THRESHOLD = 1_000
+# Most text labels drawn on a WebGL or density scatter
+SCATTER_LABEL_LIMIT = 30
+# Points kept, with their hover info, over a density scatter
+SCATTER_SAMPLE_SIZE = 2_000
+SCATTER_DENSITY_BINS = 60
+
+
+def _subset_marker(marker, rows, n):
+    """`marker` with its per-point arrays (colors, sizes) restricted to `rows`"""
+    return {key: np.asarray(value)[rows] if np.ndim(value) == 1 and len(value) == n else value
+            for key, value in marker.items()}
+
+
+def _scatter_traces(x, y, names, marker, hovertemplate, mode='auto'):
+    """
+    Traces of a labelled scatter that stays usable at any point count.
+    hovertemplate refers to the point name as %{hovertext}.
+    mode:
+    - 'svg': go.Scatter, every point labelled
+    - 'webgl': go.Scattergl, labels only on the SCATTER_LABEL_LIMIT highest points
+    - 'density': point counts on a SCATTER_DENSITY_BINS grid, under a random
+      sample of SCATTER_SAMPLE_SIZE points that keep their hover info
+    - 'auto': svg up to SCATTER_WEBGL_THRESHOLD points, webgl above
+    Returns: list of traces
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    names = np.asarray(names, dtype=object)
+    n = len(x)
+    if mode == 'auto':
+        mode = 'svg' if n <= SCATTER_WEBGL_THRESHOLD else 'webgl'
+    if mode == 'svg':
+        return [go.Scatter(x=x, y=y, mode='markers+text', marker=marker, text=names, hovertext=names,
+                           textposition='top center', hovertemplate=hovertemplate)]
+    
+    traces = []
+    # Large markers hide each other once there are thousands of them
+    marker = {**marker, 'size': 6}
+    if mode == 'density':
+        finite = np.isfinite(x) & np.isfinite(y)
+        counts, x_edges, y_edges = np.histogram2d(x[finite], y[finite], bins=SCATTER_DENSITY_BINS)
+        traces.append(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.where(counts.T > 0, counts.T, np.nan),  # Empty cells stay transparent
+            colorscale=[[0, 'rgba(0, 242, 96, 0.1)'], [1, COLOR_PALETTE['primary']]],
+            colorbar=dict(title='Nombre'),
+            hovertemplate='Nombre: %{z:.0f}<extra></extra>',
+            showlegend=False
+        ))
+        # Fixed seed: the same data always gives the same figure
+        rows = np.sort(np.random.default_rng(0).choice(n, min(n, SCATTER_SAMPLE_SIZE), replace=False))
+        marker = {**_subset_marker(marker, rows, n), 'showscale': False, 'opacity': 0.6}
+        x, y, names = x[rows], y[rows], names[rows]
+    
+    traces.append(go.Scattergl(x=x, y=y, mode='markers', marker=marker, hovertext=names,
+                               hovertemplate=hovertemplate, showlegend=False))
+    labelled = np.argsort(np.nan_to_num(y, nan=-np.inf))[-SCATTER_LABEL_LIMIT:]
+    traces.append(go.Scattergl(x=x[labelled], y=y[labelled], mode='text', text=names[labelled],
+                               textposition='top center', hoverinfo='skip', showlegend=False))
+    return traces
+
+
+def plot_value_vs_performance(team_stats_df, mode='auto'):
+    """
+    Scatter plot of squad value vs goals scored
+    mode: see _scatter_traces ('auto', 'svg', 'webgl' or 'density')
+    """
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=team_stats_df['squad_value'] / 1_000_000,
-        y=team_stats_df['goals_scored'],
-        mode='markers+text',
+    fig.add_traces(_scatter_traces(
+        team_stats_df['squad_value'].to_numpy() / 1_000_000,
+        team_stats_df['goals_scored'].to_numpy(),
+        team_stats_df['team_name'].to_numpy(),
         marker=dict(
             size=12,
-            color=team_stats_df['points'],
+            color=team_stats_df['points'].to_numpy(),
             colorscale='Viridis',
             showscale=True,
             colorbar=dict(title='Points')
         ),
-        text=team_stats_df['team_name'],
-        textposition='top center',
-        hovertemplate='<b>%{text}</b><br>Valeur: €%{x:.1f}M<br>Buts: %{y}<extra></extra>'
+        hovertemplate='<b>%{hovertext}</b><br>Valeur: €%{x:.1f}M<br>Buts: %{y}<extra></extra>',
+        mode=mode
     ))
     
     fig = apply_custom_theme(fig, 'Valeur de l\'Équipe vs Performance')
@@ -371,31 +515,27 @@ def plot_value_vs_performance(team_stats_df):
     return fig
 
 
-def plot_age_vs_value(teams_df):
-    """Scatter plot of average age vs team value"""
-    from scraper import get_team_squad
-    
-    data = []
-    for _, team in teams_df.iterrows():
-        squad = get_team_squad(team['team_name'])
-        data.append({
-            'team': team['team_name'],
-            'avg_age': squad['age'].mean(),
-            'squad_value': team['squad_value'] / 1_000_000
-        })
-    
-    df = pd.DataFrame(data)
+def plot_age_vs_value(players_df, teams_df, mode='auto'):
+    """
+    Scatter plot of average age vs team value
+    mode: see _scatter_traces ('auto', 'svg', 'webgl' or 'density')
+    """
+    avg_age = players_df.groupby('nationality', observed=True)['age'].mean()
+    df = pd.DataFrame({
+        'team': teams_df['team_name'].to_numpy(),
+        'avg_age': teams_df['team_name'].map(avg_age).to_numpy(),
+        'squad_value': teams_df['squad_value'].to_numpy() / 1_000_000
+    })
     
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=df['avg_age'],
-        y=df['squad_value'],
-        mode='markers+text',
+    fig.add_traces(_scatter_traces(
+        df['avg_age'],
+        df['squad_value'],
+        df['team'],
         marker=dict(size=12, color=COLOR_PALETTE['secondary']),
-        text=df['team'],
-        textposition='top center',
-        hovertemplate='<b>%{text}</b><br>Âge moyen: %{x:.1f}<br>Valeur: €%{y:.1f}M<extra></extra>'
+        hovertemplate='<b>%{hovertext}</b><br>Âge moyen: %{x:.1f}<br>Valeur: €%{y:.1f}M<extra></extra>',
+        mode=mode
     ))
     
     fig = apply_custom_theme(fig, 'Âge Moyen vs Valeur de l\'Équipe')
@@ -487,14 +627,18 @@ def plot_team_radar(team_stats_df, team_names):
 
 # ============ LINE CHARTS ============
 
-def plot_performance_evolution(matches_df, team_name):
-    """Line chart showing team performance over matches"""
-    team_matches = matches_df[
-        (matches_df['team_home'] == team_name) | 
-        (matches_df['team_away'] == team_name)
-    ].copy()
-    
-    team_matches = team_matches.sort_values('date')
+def plot_performance_evolution(matches_df, team_name, matches_index=None):
+    """
+    Line chart showing team performance over matches
+    matches_index (scraper.build_matches_index) avoids scanning every match
+    """
+    if matches_index is not None:
+        team_matches = matches_df.iloc[matches_index['team'].get(team_name, [])]
+    else:
+        team_matches = matches_df[
+            (matches_df['team_home'] == team_name) | 
+            (matches_df['team_away'] == team_name)
+        ].sort_values('date')
     
     cumulative_goals = []
     cumulative_points = []
@@ -567,7 +711,7 @@ def plot_performance_evolution(matches_df, team_name):
 
 def plot_group_comparison(team_stats_df):
     """Bar chart comparing groups"""
-    group_stats = team_stats_df.groupby('group').agg({
+    group_stats = team_stats_df.groupby('group', observed=True).agg({
         'squad_value': 'mean',
         'goals_scored': 'sum',
         'avg_age': 'mean'
@@ -615,3 +759,54 @@ def plot_group_comparison(team_stats_df):
     fig.update_yaxes(title_text='Années', row=1, col=3)
     
     return fig
+
+
+# ============ FIGURE CACHE ============
+
+# Serialized figures kept across reruns and sessions, least recently used first out
+FIGURE_CACHE_ENTRIES = 256
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+_figure_cache = memo.LRUCache(FIGURE_CACHE_ENTRIES, FIGURE_CACHE_BYTES)
+
+
+def _fingerprint(value):
+    """
+    Cache-key part of a figure: lists (e.g. selected teams) become tuples,
+    anything else must be hashable. Frames are never part of a key: they
+    are identified by the data version and the selections they derive from.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_fingerprint(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        raise TypeError(f"Unhashable figure cache key part: {type(value).__name__}") from None
+    return value
+
+
+def cached_figure(builder, key, *args, **kwargs):
+    """
+    builder(*args, **kwargs), served from the figure cache when the same
+    builder already ran for the same key: the data version and every
+    selection or option the arguments depend on. Each call returns a new
+    figure, safe to modify; a cached one is not validated again.
+    """
+    name = builder.__name__
+    key = (name, _fingerprint(key))
+    found, payload = _figure_cache.get(key, name)
+    if found:
+        return go.Figure(json.loads(payload), _validate=False)
+    fig = builder(*args, **kwargs)
+    _figure_cache.put(key, pio.to_json(fig, validate=False), name)
+    return fig
+
+
+def figure_cache_stats():
+    """Hits, misses and evictions per builder, entry count and bytes"""
+    return _figure_cache.stats()
+
+
+def clear_figure_cache():
+    """Drop every cached figure"""
+    _figure_cache.clear()